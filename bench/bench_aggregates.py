@@ -0,0 +1,129 @@
+#   Benchmark de getAllHours / getAllMinutes / getHourByNumber
+#   Compara el camino viejo (cargar objetos WallData y sumar en Python)
+#   contra los GROUP BY de power_sums() sobre una base SQLite sintética.
+#
+#   python bench/bench_aggregates.py --rows 1000000 --days 30
+
+import argparse
+import json
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+
+def build_database(path, rows, days, seed):
+    # Llena wall_data con lecturas repartidas en los últimos `days` días
+    random.seed(seed)
+    start = datetime(2025, 1, 1)
+    seconds = days * 24 * 3600
+
+    connection = sqlite3.connect(path)
+    batch = []
+    for _ in range(rows):
+        date = start + timedelta(seconds=random.randrange(seconds))
+        batch.append((
+            date.strftime('%Y-%m-%d %H:%M:%S.000000'),
+            int(date.strftime('%Y%m%d%H')),
+            random.randint(1, 3),
+            *[random.random() * 5 for _ in range(5)]
+        ))
+        if len(batch) == 50000:
+            connection.executemany('INSERT INTO wall_data (date, hour_bucket, "group", propeller1, propeller2, propeller3, propeller4, propeller5) VALUES (?, ?, ?, ?, ?, ?, ?, ?)', batch)
+            batch = []
+    if batch:
+        connection.executemany('INSERT INTO wall_data (date, hour_bucket, "group", propeller1, propeller2, propeller3, propeller4, propeller5) VALUES (?, ?, ?, ?, ?, ?, ?, ?)', batch)
+    connection.commit()
+    connection.close()
+    return start
+
+
+def timed(function, repeat):
+    # Mejor tiempo de `repeat` corridas, en milisegundos
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        elapsed = (time.perf_counter() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return round(best, 3)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de agregados de potencia')
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), 'bench.db')
+    os.environ['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///' + path
+
+    from sqlalchemy import func
+    from muro_eolico import create_app, db
+    from muro_eolico.aggregates import power_sums
+    from muro_eolico.config import PROPELLERS
+    from muro_eolico.models import WallData
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+
+    start = build_database(path, args.rows, args.days, args.seed)
+    day_start = start + timedelta(days=args.days // 2)
+    day_end = day_start + timedelta(days=1)
+    hour_start = day_start.replace(hour=12)
+    hour_end = hour_start + timedelta(hours=1)
+
+    def old_hours():
+        hourly_totals = {hour: 0 for hour in range(24)}
+        for data in WallData.query.filter(WallData.date >= day_start, WallData.date < day_end).all():
+            hourly_totals[data.date.hour] += ((data.propeller1 ** 2/216 * 1000) + (data.propeller2 ** 2/216 * 1000) + (data.propeller3 ** 2/216 * 1000) + (data.propeller4 ** 2/216 * 1000) + (data.propeller5 ** 2/216 * 1000))
+        return hourly_totals
+
+    def old_minutes():
+        minute_totals = {minute: [0] * 6 for minute in range(60)}
+        for data in WallData.query.filter(WallData.date >= hour_start, WallData.date < hour_end).all():
+            powers = [getattr(data, propeller) ** 2/216 * 1000 for propeller in PROPELLERS]
+            for i, power in enumerate(powers):
+                minute_totals[data.date.minute][i] += power
+            minute_totals[data.date.minute][5] += sum(powers)
+        return minute_totals
+
+    def old_hour_by_number():
+        total = 0
+        for data in WallData.query.filter(WallData.date >= day_start, WallData.date < day_end).all():
+            if data.date.hour == 12:
+                total += data.propeller1 + data.propeller2 + data.propeller3 + data.propeller4 + data.propeller5
+        return total
+
+    def new_hour_by_number():
+        return db.session.query(
+            func.sum(WallData.propeller1 + WallData.propeller2 + WallData.propeller3 + WallData.propeller4 + WallData.propeller5)
+        ).filter(WallData.date >= hour_start, WallData.date < hour_end).scalar()
+
+    results = {'rows': args.rows, 'days': args.days, 'timings_ms': {}}
+    with app.app_context():
+        cases = {
+            'getAllHours': (old_hours, lambda: power_sums(day_start, day_end, 'hour')),
+            'getAllMinutes': (old_minutes, lambda: power_sums(hour_start, hour_end, 'minute')),
+            'getHourByNumber': (old_hour_by_number, new_hour_by_number),
+        }
+        for name, (old, new) in cases.items():
+            results['timings_ms'][name] = {
+                'python_loop': timed(old, args.repeat),
+                'group_by': timed(new, args.repeat),
+            }
+            db.session.remove()
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+#   Benchmark de /analytics
+#   Compara las estadísticas por bucket calculadas con ciclos de Python
+#   (potencia lectura por lectura, como getAllHours / getWeek) contra
+#   analytics.summarize() con NumPy, sobre lecturas sintéticas en memoria.
+#   La lectura de la base es la misma para los dos y no se mide aquí.
+#
+#   python bench/bench_analytics.py --rows 100000,1000000,10000000 --bucket hour
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+import numpy
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from muro_eolico import analytics
+
+PROPELLERS = ('propeller1', 'propeller2', 'propeller3', 'propeller4', 'propeller5')
+
+
+def power(value):
+    # Misma conversión que propeller_power() en muro_eolico/aggregates.py
+    return value * value / 216 * 1000
+
+
+def build_readings(rows, days, seed):
+    # Fechas al azar en `days` días, grupos 1..3 y lecturas de 0 a 5
+    generator = numpy.random.default_rng(seed)
+    start = numpy.datetime64('2025-01-01T00:00:00', 'us')
+    offsets = generator.integers(0, days * 24 * 3600, rows).astype('timedelta64[s]')
+    dates = numpy.sort(start + offsets)
+    groups = generator.integers(1, 4, rows)
+    readings = generator.random((rows, len(PROPELLERS))) * 5
+    return dates, groups, readings
+
+
+def percentile(values, q):
+    # Interpolación lineal sobre una lista ya ordenada
+    position = (len(values) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+def python_summary(rows, bucket):
+    # rows: lista de (datetime, group, p1..p5)
+    truncate = {
+        'minute': lambda date: date.replace(second=0, microsecond=0),
+        'hour': lambda date: date.replace(minute=0, second=0, microsecond=0),
+        'day': lambda date: date.replace(hour=0, minute=0, second=0, microsecond=0),
+        'month': lambda date: date.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    }[bucket]
+
+    buckets = {}
+    for date, group, *values in rows:
+        powers = [power(value) for value in values]
+        data = buckets.setdefault(truncate(date), {'propellers': [[] for _ in PROPELLERS], 'groups': {}})
+        for i, value in enumerate(powers):
+            data['propellers'][i].append(value)
+        data['groups'].setdefault(group, []).append(sum(powers))
+
+    result = []
+    for date in sorted(buckets):
+        series = buckets[date]['propellers'] + list(buckets[date]['groups'].values())
+        stats = []
+        for values in series:
+            values.sort()
+            total = sum(values)
+            stats.append({
+                'energy': total,
+                'mean': total / len(values),
+                'max': values[-1],
+                **{f'p{q}': percentile(values, q) for q in analytics.PERCENTILES}
+            })
+        result.append((date, stats))
+    return result
+
+
+def timed(function, repeat):
+    # Mejor tiempo de `repeat` corridas, en milisegundos
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        elapsed = (time.perf_counter() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return round(best, 3)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de analytics.summarize')
+    parser.add_argument('--rows', default='100000,1000000,10000000', help='Tamaños separados por coma')
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--bucket', default='hour', choices=list(analytics.BUCKETS))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--python-max-rows', type=int, default=10000000, help='No corre el ciclo de Python arriba de esto')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    results = {'days': args.days, 'bucket': args.bucket, 'timings_ms': {}}
+    for rows in [int(value) for value in args.rows.split(',')]:
+        dates, groups, readings = build_readings(rows, args.days, args.seed)
+
+        timings = {
+            'numpy': timed(lambda: analytics.summarize(dates, groups, readings, args.bucket, power), args.repeat)
+        }
+        if rows <= args.python_max_rows:
+            # Lo que regresaría la consulta: tuplas con datetime de Python
+            python_rows = list(zip(dates.astype(datetime).tolist(), groups.tolist(), *readings.T.tolist()))
+            timings['python_loop'] = timed(lambda: python_summary(python_rows, args.bucket), 1)
+            timings['speedup'] = round(timings['python_loop'] / timings['numpy'], 1)
+
+        results['timings_ms'][str(rows)] = timings
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,198 @@
+#   Benchmark de carga de la API
+#   Mide throughput y latencia p50/p95/p99 de los endpoints principales con
+#   el test client de Flask y con un driver HTTP de varios hilos. Por omisión
+#   crea una base SQLite sintética con synthetic.build() y levanta la app en
+#   un servidor local; con --target se prueba un servidor ya corriendo (su
+#   base se llena antes con bench/synthetic.py).
+#   La salida es JSON para comparar entre commits.
+#
+#   python bench/bench_api.py --rows 200000 --requests 200 --threads 8 --output before.json
+
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pytz
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import synthetic
+
+BASE_URL = '/api/v1'
+
+
+def endpoints(full_lists):
+    # (nombre, método, ruta, cuerpo). Las listas van paginadas salvo con
+    # --full-lists, si no cada petición regresaría toda la tabla.
+    now = datetime.now(pytz.timezone('America/Mexico_City'))
+    today = now.strftime('%Y-%m-%d')
+    hour = urllib.parse.quote(now.strftime('%Y-%m-%d %H:00:00'))
+    page = '' if full_lists else '?limit=1000'
+    reading = {'group': 1, 'propeller1': 1.5, 'propeller2': 2.0, 'propeller3': 0.5, 'propeller4': 1.0, 'propeller5': 3.0}
+    return [
+        ('new', 'POST', BASE_URL + '/new', reading),
+        ('getAllHours', 'GET', f'{BASE_URL}/getAllHours?date={today}', None),
+        ('getAllMinutes', 'GET', f'{BASE_URL}/getAllMinutes?date={hour}', None),
+        ('readAll', 'GET', BASE_URL + '/readAll' + page, None),
+        ('read30days', 'GET', BASE_URL + '/read30days', None),
+        ('statusHistory', 'GET', BASE_URL + '/statusHistory' + page, None),
+        ('get_totals', 'GET', BASE_URL + '/get_totals', None),
+    ]
+
+
+def client_request(app):
+    # Un test client por hilo
+    local = threading.local()
+
+    def send(method, path, body):
+        if not hasattr(local, 'client'):
+            local.client = app.test_client()
+        response = local.client.open(path, method=method, json=body)
+        response.get_data()
+        return response.status_code
+    return send
+
+
+def http_request(base):
+    def send(method, path, body):
+        data = json.dumps(body).encode() if body is not None else None
+        request = urllib.request.Request(base + path, data=data, method=method, headers={'Content-Type': 'application/json'})
+        try:
+            with urllib.request.urlopen(request, timeout=120) as response:
+                response.read()
+                return response.status
+        except urllib.error.HTTPError as error:
+            return error.code
+    return send
+
+
+def run_endpoint(send, method, path, body, requests, threads, warmup):
+    for _ in range(warmup):
+        send(method, path, body)
+
+    def one(_):
+        started = time.perf_counter()
+        status = send(method, path, body)
+        return (time.perf_counter() - started) * 1000, status
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        samples = list(pool.map(one, range(requests)))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(ms for ms, _ in samples)
+    quantiles = statistics.quantiles(latencies, n=100, method='inclusive') if len(latencies) > 1 else latencies * 99
+    return {
+        'requests': requests,
+        'errors': sum(1 for _, status in samples if status >= 400),
+        'throughput_rps': round(requests / elapsed, 2),
+        'mean_ms': round(statistics.fmean(latencies), 3),
+        'p50_ms': round(quantiles[49], 3),
+        'p95_ms': round(quantiles[94], 3),
+        'p99_ms': round(quantiles[98], 3),
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de carga de la API')
+    parser.add_argument('--url', help='SQLALCHEMY_DATABASE_URI (por omisión una SQLite temporal nueva)')
+    parser.add_argument('--target', help='URL de un servidor ya corriendo, p. ej. http://127.0.0.1:8000')
+    parser.add_argument('--driver', choices=['client', 'http', 'both'], default='both')
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--days', type=int, default=90)
+    parser.add_argument('--status-rows', type=int, default=10000)
+    parser.add_argument('--requests', type=int, default=200, help='Peticiones por endpoint')
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument('--full-lists', action='store_true', help='readAll y statusHistory sin paginar')
+    parser.add_argument('--no-cache', action='store_true', help='CACHE_TTL=0 para medir sin la caché de respuestas')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='Archivo JSON de salida (por omisión stdout)')
+    args = parser.parse_args()
+
+    results = {
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'rows': args.rows,
+        'days': args.days,
+        'status_rows': args.status_rows,
+        'requests': args.requests,
+        'threads': args.threads,
+        'full_lists': args.full_lists,
+        'results': {}
+    }
+    targets = endpoints(args.full_lists)
+
+    if args.target:
+        results['target'] = args.target
+        results['results']['http'] = {
+            name: run_endpoint(http_request(args.target.rstrip('/')), method, path, body, args.requests, args.threads, args.warmup)
+            for name, method, path, body in targets
+        }
+    else:
+        url = args.url or 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'bench.db')
+        os.environ['SQLALCHEMY_DATABASE_URI'] = url
+        os.environ['SCHEDULER_MODE'] = 'off'
+        if args.no_cache:
+            os.environ['CACHE_TTL'] = '0'
+
+        from muro_eolico import create_app, db
+        from werkzeug.serving import make_server
+
+        app = create_app()
+        with app.app_context():
+            db.drop_all()
+            db.create_all()
+            synthetic.build(args.rows, args.days, args.status_rows, args.seed)
+            results['database'] = db.engine.dialect.name
+
+        drivers = {}
+        if args.driver in ('client', 'both'):
+            drivers['client'] = client_request(app)
+        if args.driver in ('http', 'both'):
+            # Sin el log de acceso de werkzeug por cada petición
+            logging.getLogger('werkzeug').setLevel(logging.ERROR)
+            server = make_server('127.0.0.1', 0, app, threaded=True)
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            drivers['http'] = http_request(f'http://127.0.0.1:{server.server_port}')
+
+        for driver, send in drivers.items():
+            results['results'][driver] = {
+                name: run_endpoint(send, method, path, body, args.requests, args.threads, args.warmup)
+                for name, method, path, body in targets
+            }
+
+        if 'http' in drivers:
+            server.shutdown()
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as file:
+            file.write(output + '\n')
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+#   Benchmark de la serialización de readAll
+#   Compara el camino viejo (objetos WallData + to_json() + un dumps por
+#   renglón) contra las tuplas de columnas de ROW_SERIALIZERS codificadas
+#   por lote, con json y con orjson si está instalado. Reporta el costo
+#   por renglón en microsegundos y revisa que los bytes sean iguales.
+#
+#   python bench/bench_serialization.py --rows 200000
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from bench_aggregates import build_database
+
+
+def timed(function, repeat):
+    # Mejor tiempo de `repeat` corridas en segundos, con el último resultado
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de serialización de listas')
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), 'bench.db')
+    os.environ['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///' + path
+
+    from muro_eolico import create_app, db, serialization
+    from muro_eolico.config import STREAM_BATCH_SIZE
+    from muro_eolico.models import WallData
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+    build_database(path, args.rows, args.days, args.seed)
+
+    orjson = serialization.orjson
+
+    def old():
+        dumps = lambda row: app.json.dumps(row.to_json(), separators=(',', ':'))
+        return '[' + ','.join(dumps(row) for row in WallData.query.order_by(WallData.id).yield_per(STREAM_BATCH_SIZE)) + ']\n'
+
+    def new():
+        query, to_json = serialization.serialized_rows(WallData.query.order_by(WallData.id), WallData)
+        rows = map(to_json, query.yield_per(STREAM_BATCH_SIZE))
+        return ''.join(serialization.encode_rows(rows, False))
+
+    results = {'rows': args.rows, 'us_per_row': {}}
+    with app.app_context():
+        seconds, expected = timed(old, args.repeat)
+        results['us_per_row']['orm_to_json'] = round(seconds / args.rows * 1e6, 3)
+        db.session.remove()
+
+        serialization.orjson = None
+        seconds, body = timed(new, args.repeat)
+        results['us_per_row']['tuples_json'] = round(seconds / args.rows * 1e6, 3)
+        results['identical'] = body == expected
+        db.session.remove()
+
+        if orjson is not None:
+            serialization.orjson = orjson
+            seconds, body = timed(new, args.repeat)
+            results['us_per_row']['tuples_orjson'] = round(seconds / args.rows * 1e6, 3)
+            results['identical'] = results['identical'] and body == expected
+            db.session.remove()
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
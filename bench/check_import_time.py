@@ -0,0 +1,71 @@
+#   Revisión del tiempo de importación de app.py
+#   Importa `app` en un proceso nuevo con `python -X importtime` y reporta
+#   el tiempo acumulado y los módulos más lentos. Sale con código 1 si se
+#   pasa de --budget-ms o si al arrancar se cargó algo que debe importarse
+#   hasta usarse (Alembic, APScheduler, numpy, pyarrow, cProfile). Sirve
+#   para vigilar los cold starts de Vercel entre commits.
+#
+#   python bench/check_import_time.py --budget-ms 1500 --repeat 3
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+# Módulos que no deben cargarse al importar la app
+FORBIDDEN = ('flask_migrate', 'alembic', 'apscheduler', 'numpy', 'pyarrow', 'cProfile', 'pstats')
+
+
+def import_times(module):
+    # {módulo: (propio µs, acumulado µs)} de una importación en frío
+    env = dict(os.environ)
+    env['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'import.db')
+    env['SCHEDULER_MODE'] = 'off'
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                               cwd=ROOT, env=env, capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise SystemExit(completed.stderr)
+
+    times = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = (int(own), int(cumulative))
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Tiempo de importación de la app')
+    parser.add_argument('--module', default='app')
+    parser.add_argument('--budget-ms', type=float, default=1500)
+    parser.add_argument('--repeat', type=int, default=3, help='Se reporta la corrida más rápida')
+    parser.add_argument('--top', type=int, default=15)
+    args = parser.parse_args()
+
+    runs = [import_times(args.module) for _ in range(args.repeat)]
+    times = min(runs, key=lambda run: run[args.module][1])
+    total_ms = times[args.module][1] / 1000
+
+    loaded = sorted(name for name in FORBIDDEN if name in times)
+    slowest = sorted(times.items(), key=lambda item: item[1][0], reverse=True)[:args.top]
+
+    results = {
+        'module': args.module,
+        'total_ms': round(total_ms, 1),
+        'budget_ms': args.budget_ms,
+        'forbidden_loaded': loaded,
+        'slowest_self_ms': {name: round(own / 1000, 1) for name, (own, _) in slowest},
+    }
+    print(json.dumps(results, indent=2))
+
+    if total_ms > args.budget_ms or loaded:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
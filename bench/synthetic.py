@@ -0,0 +1,144 @@
+#   Base de datos sintética para los benchmarks
+#   Llena WallData con lecturas de los tres grupos en los últimos `days`
+#   días, los totales que corresponden (día, mes, hora, minuto, grupo y
+#   total) y un historial de SystemStatus. Usa los modelos de muro_eolico,
+#   así que sirve igual para SQLite que para PostgreSQL.
+#
+#   python bench/synthetic.py --url sqlite:////tmp/bench.db --rows 1000000 --days 90 --status-rows 100000
+
+import argparse
+import os
+import random
+import sys
+from datetime import datetime, timedelta
+
+import pytz
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+CHUNK = 10000
+
+
+def insert_chunks(model, rows):
+    # INSERT con executemany por lotes, sin objetos del ORM
+    from muro_eolico.database import db
+
+    table = model.__table__
+    for start in range(0, len(rows), CHUNK):
+        db.session.execute(table.insert(), rows[start:start + CHUNK])
+
+
+def build(rows, days, status_rows, seed=0):
+    # Debe correr dentro de app.app_context() con las tablas ya creadas.
+    # Las lecturas terminan en la hora actual de México para que los
+    # endpoints de "hoy" y "últimos 30 días" encuentren datos.
+    # muro_eolico se importa aquí: su configuración se lee del entorno al
+    # importar y quien llama la ajusta antes.
+    from muro_eolico.aggregates import add_power
+    from muro_eolico.config import PROPELLERS
+    from muro_eolico.database import db
+    from muro_eolico.dates import mexico_tz, hour_bucket
+    from muro_eolico.models import (
+        WallData, TotalDay, TotalMonth, TotalAll, TotalGroup, TotalHour, TotalMinute, SystemStatus, CurrentStatus
+    )
+
+    random.seed(seed)
+    end = datetime.now(mexico_tz).replace(tzinfo=None, microsecond=0)
+    start = end - timedelta(days=days)
+    seconds = days * 24 * 3600
+
+    day_totals = {}
+    month_totals = {}
+    group_totals = {}
+    hour_totals = {}
+    minute_totals = {}
+    grand_total = 0
+
+    batch = []
+    for _ in range(rows):
+        date = start + timedelta(seconds=random.randrange(seconds))
+        reading = {'date': date, 'group': random.randint(1, 3)}
+        for propeller in PROPELLERS:
+            reading[propeller] = 0.2 + random.random() * 4.8
+
+        total_sum = sum(reading[propeller] for propeller in PROPELLERS)
+        totals = day_totals.setdefault(date.date(), [0, 0, 0, 0])
+        totals[0] += total_sum
+        totals[1] += reading['propeller1'] + reading['propeller2']
+        totals[2] += reading['propeller3']
+        totals[3] += reading['propeller4'] + reading['propeller5']
+        month = date.date().replace(day=1)
+        month_totals[month] = month_totals.get(month, 0) + total_sum
+        group_totals[reading['group']] = group_totals.get(reading['group'], 0) + total_sum
+        grand_total += total_sum
+
+        minute = date.replace(second=0)
+        add_power(hour_totals, minute.replace(minute=0), reading)
+        add_power(minute_totals, minute, reading)
+
+        reading['hour_bucket'] = hour_bucket(date)
+        batch.append(reading)
+        if len(batch) == CHUNK:
+            insert_chunks(WallData, batch)
+            batch = []
+    insert_chunks(WallData, batch)
+
+    insert_chunks(TotalDay, [
+        {'date': day, 'total': totals[0], 'group1': totals[1], 'group2': totals[2], 'group3': totals[3]}
+        for day, totals in day_totals.items()
+    ])
+    insert_chunks(TotalMonth, [{'date': month, 'total': total} for month, total in month_totals.items()])
+    insert_chunks(TotalAll, [{'id': 1, 'total': grand_total}])
+    insert_chunks(TotalGroup, [{'group': group, 'total': total} for group, total in group_totals.items()])
+    for model, buckets in ((TotalHour, hour_totals), (TotalMinute, minute_totals)):
+        insert_chunks(model, [
+            {'date': bucket, **dict(zip(PROPELLERS + ('total',), totals))}
+            for bucket, totals in buckets.items()
+        ])
+
+    # Historial de estados alternando 1/0 en intervalos iguales (UTC),
+    # el último queda abierto y es el estado actual
+    now = datetime.now(pytz.utc).replace(tzinfo=None, microsecond=0)
+    step = timedelta(seconds=seconds) / max(status_rows, 1)
+    statuses = []
+    for i in range(status_rows):
+        started = now - step * (status_rows - i)
+        statuses.append({
+            'status': (i + 1) % 2,
+            'last_update': started,
+            'ended_at': started + step if i < status_rows - 1 else None
+        })
+    insert_chunks(SystemStatus, statuses)
+    if statuses:
+        insert_chunks(CurrentStatus, [{'id': 1, 'status': statuses[-1]['status'], 'last_update': now}])
+
+    db.session.commit()
+    return {'wall_data': rows, 'total_day': len(day_totals), 'total_month': len(month_totals), 'system_status': status_rows}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Crea una base sintética para los benchmarks')
+    parser.add_argument('--url', required=True, help='SQLALCHEMY_DATABASE_URI destino')
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--days', type=int, default=90)
+    parser.add_argument('--status-rows', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--reset', action='store_true', help='Borra las tablas antes de llenarlas')
+    args = parser.parse_args()
+
+    os.environ['SQLALCHEMY_DATABASE_URI'] = args.url
+    os.environ.setdefault('SCHEDULER_MODE', 'off')
+
+    from muro_eolico import create_app, db
+
+    with create_app().app_context():
+        if args.reset:
+            db.drop_all()
+        db.create_all()
+        counts = build(args.rows, args.days, args.status_rows, args.seed)
+
+    print(counts)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+"""add total_group
+
+Revision ID: 1c5e8a3f9d74
+Revises: 6e2b9c4f7a15
+Create Date: 2026-10-18 21:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '1c5e8a3f9d74'
+down_revision = '6e2b9c4f7a15'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('total_group',
+    sa.Column('group', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('total', sa.Float(), nullable=False),
+    sa.PrimaryKeyConstraint('group')
+    )
+
+    # Totales iniciales desde WallData más lo ya compactado por hora
+    propellers = ' + '.join(f'propeller{n}' for n in range(1, 6))
+    rollup = ' + '.join(f'propeller{n}_sum' for n in range(1, 6))
+    op.execute(f"""
+        INSERT INTO total_group ("group", total)
+        SELECT "group", sum(total) FROM (
+            SELECT "group", {propellers} AS total FROM wall_data
+            UNION ALL
+            SELECT "group", {rollup} AS total FROM wall_data_rollup WHERE resolution = 'hour'
+        ) AS totals
+        GROUP BY "group"
+    """)
+
+
+def downgrade():
+    op.drop_table('total_group')
@@ -0,0 +1,33 @@
+"""add system_status
+
+Revision ID: 3b8c1f0a9d2e
+Revises: f31eeb68c214
+Create Date: 2025-03-01 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3b8c1f0a9d2e'
+down_revision = 'f31eeb68c214'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # La tabla se creó con db.create_all() en algunas instalaciones
+    if sa.inspect(op.get_bind()).has_table('system_status'):
+        return
+
+    op.create_table('system_status',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('status', sa.Integer(), nullable=False),
+    sa.Column('last_update', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade():
+    op.drop_table('system_status')
@@ -0,0 +1,29 @@
+"""add scheduler_lease
+
+Revision ID: 4f9b1d2c8e60
+Revises: e8a3b62f1c57
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4f9b1d2c8e60'
+down_revision = 'e8a3b62f1c57'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('scheduler_lease',
+    sa.Column('name', sa.String(length=64), nullable=False),
+    sa.Column('owner', sa.String(length=128), nullable=False),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade():
+    op.drop_table('scheduler_lease')
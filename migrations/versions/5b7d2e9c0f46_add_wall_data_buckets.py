@@ -0,0 +1,38 @@
+"""add wall_data hour bucket
+
+Revision ID: 5b7d2e9c0f46
+Revises: 1c5e8a3f9d74
+Create Date: 2026-10-18 22:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b7d2e9c0f46'
+down_revision = '1c5e8a3f9d74'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('wall_data', sa.Column('hour_bucket', sa.Integer(), nullable=True))
+
+    # YYYYMMDDHH de la fecha local que ya está guardada
+    wall_data = sa.table('wall_data', sa.column('date', sa.DateTime()), sa.column('hour_bucket', sa.Integer()))
+    hour = (
+        sa.extract('year', wall_data.c.date) * 1000000
+        + sa.extract('month', wall_data.c.date) * 10000
+        + sa.extract('day', wall_data.c.date) * 100
+        + sa.extract('hour', wall_data.c.date)
+    )
+    op.execute(wall_data.update().values(hour_bucket=hour))
+
+    with op.batch_alter_table('wall_data') as batch_op:
+        batch_op.alter_column('hour_bucket', existing_type=sa.Integer(), nullable=False)
+
+
+def downgrade():
+    with op.batch_alter_table('wall_data') as batch_op:
+        batch_op.drop_column('hour_bucket')
@@ -0,0 +1,124 @@
+"""partition wall_data and temp_wall_data by month
+
+Revision ID: 6e2b9c4f7a15
+Revises: d14e7a0c9b35
+Create Date: 2026-10-18 20:00:00.000000
+
+Solo corre en PostgreSQL con WALLDATA_PARTITIONING=1; en cualquier otro
+caso no hace nada y las tablas siguen como estaban.
+
+"""
+from datetime import date
+import os
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6e2b9c4f7a15'
+down_revision = 'd14e7a0c9b35'
+branch_labels = None
+depends_on = None
+
+MONTHS_AHEAD = int(os.getenv('PARTITION_MONTHS_AHEAD', 3))
+
+TABLES = {
+    'wall_data': {
+        'ix_wall_data_date': '(date)'
+    },
+    'temp_wall_data': {
+        'ix_temp_wall_data_group_id': '("group", id)',
+        'ix_temp_wall_data_date': '(date)'
+    }
+}
+
+COLUMNS = ', '.join(['date', '"group"'] + [f'propeller{n}' for n in range(1, 6)])
+
+
+def enabled():
+    return op.get_bind().dialect.name == 'postgresql' and os.getenv('WALLDATA_PARTITIONING', '0') == '1'
+
+
+def add_months(month_start, months):
+    month = month_start.month - 1 + months
+    return month_start.replace(year=month_start.year + month // 12, month=month % 12 + 1, day=1)
+
+
+def upgrade():
+    if not enabled():
+        return
+
+    for table, indexes in TABLES.items():
+        # La tabla actual se renombra y sus datos pasan a la particionada
+        op.execute(f'ALTER TABLE {table} RENAME TO {table}_old')
+        op.execute(f'ALTER TABLE {table}_old RENAME CONSTRAINT {table}_pkey TO {table}_old_pkey')
+        for index in indexes:
+            op.execute(f'ALTER INDEX {index} RENAME TO {index}_old')
+        op.execute(f'ALTER SEQUENCE {table}_id_seq OWNED BY NONE')
+
+        # La llave de una tabla particionada tiene que incluir la columna de partición
+        op.execute(f"""
+            CREATE TABLE {table} (
+                id INTEGER NOT NULL DEFAULT nextval('{table}_id_seq'),
+                date TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+                "group" INTEGER NOT NULL,
+                propeller1 FLOAT NOT NULL,
+                propeller2 FLOAT NOT NULL,
+                propeller3 FLOAT NOT NULL,
+                propeller4 FLOAT NOT NULL,
+                propeller5 FLOAT NOT NULL,
+                CONSTRAINT {table}_pkey PRIMARY KEY (id, date)
+            ) PARTITION BY RANGE (date)
+        """)
+        op.execute(f'ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id')
+        for index, columns in indexes.items():
+            op.execute(f'CREATE INDEX {index} ON {table} {columns}')
+
+        # Lecturas fuera de cualquier mes creado caen en la partición default
+        op.execute(f'CREATE TABLE {table}_default PARTITION OF {table} DEFAULT')
+
+        first = op.get_bind().execute(sa.text(f'SELECT min(date) FROM {table}_old')).scalar()
+        month = (first.date() if first else date.today()).replace(day=1)
+        last = add_months(date.today().replace(day=1), MONTHS_AHEAD)
+        while month <= last:
+            op.execute(
+                f"CREATE TABLE {table}_p{month.strftime('%Y_%m')} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+            )
+            month = add_months(month, 1)
+
+        op.execute(f'INSERT INTO {table} (id, {COLUMNS}) SELECT id, {COLUMNS} FROM {table}_old')
+        op.execute(f'DROP TABLE {table}_old')
+
+
+def downgrade():
+    if not enabled():
+        return
+
+    for table, indexes in TABLES.items():
+        op.execute(f'ALTER TABLE {table} RENAME TO {table}_partitioned')
+        op.execute(f'ALTER TABLE {table}_partitioned RENAME CONSTRAINT {table}_pkey TO {table}_partitioned_pkey')
+        for index in indexes:
+            op.execute(f'ALTER INDEX {index} RENAME TO {index}_partitioned')
+        op.execute(f'ALTER SEQUENCE {table}_id_seq OWNED BY NONE')
+
+        op.execute(f"""
+            CREATE TABLE {table} (
+                id INTEGER NOT NULL DEFAULT nextval('{table}_id_seq'),
+                date TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+                "group" INTEGER NOT NULL,
+                propeller1 FLOAT NOT NULL,
+                propeller2 FLOAT NOT NULL,
+                propeller3 FLOAT NOT NULL,
+                propeller4 FLOAT NOT NULL,
+                propeller5 FLOAT NOT NULL,
+                CONSTRAINT {table}_pkey PRIMARY KEY (id)
+            )
+        """)
+        op.execute(f'ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id')
+        for index, columns in indexes.items():
+            op.execute(f'CREATE INDEX {index} ON {table} {columns}')
+
+        op.execute(f'INSERT INTO {table} (id, {COLUMNS}) SELECT id, {COLUMNS} FROM {table}_partitioned')
+        op.execute(f'DROP TABLE {table}_partitioned CASCADE')
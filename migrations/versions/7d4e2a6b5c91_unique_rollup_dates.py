@@ -0,0 +1,54 @@
+"""unique dates for total_day and total_month, single total_all row
+
+Revision ID: 7d4e2a6b5c91
+Revises: 3b8c1f0a9d2e
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '7d4e2a6b5c91'
+down_revision = '3b8c1f0a9d2e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Juntar las fechas duplicadas en el renglón con el id más bajo
+    op.execute("""
+        UPDATE total_day SET
+            total = (SELECT SUM(t.total) FROM total_day t WHERE t.date = total_day.date),
+            group1 = (SELECT SUM(t.group1) FROM total_day t WHERE t.date = total_day.date),
+            group2 = (SELECT SUM(t.group2) FROM total_day t WHERE t.date = total_day.date),
+            group3 = (SELECT SUM(t.group3) FROM total_day t WHERE t.date = total_day.date)
+        WHERE id IN (SELECT MIN(id) FROM total_day GROUP BY date HAVING COUNT(*) > 1)
+    """)
+    op.execute("DELETE FROM total_day WHERE id NOT IN (SELECT MIN(id) FROM total_day GROUP BY date)")
+
+    op.execute("""
+        UPDATE total_month SET
+            total = (SELECT SUM(t.total) FROM total_month t WHERE t.date = total_month.date)
+        WHERE id IN (SELECT MIN(id) FROM total_month GROUP BY date HAVING COUNT(*) > 1)
+    """)
+    op.execute("DELETE FROM total_month WHERE id NOT IN (SELECT MIN(id) FROM total_month GROUP BY date)")
+
+    # TotalAll queda en un solo renglón con id = 1, que es la llave del upsert
+    op.execute("UPDATE total_all SET total = (SELECT SUM(t.total) FROM total_all t) WHERE id = (SELECT MIN(id) FROM total_all)")
+    op.execute("DELETE FROM total_all WHERE id <> (SELECT MIN(id) FROM total_all)")
+    op.execute("UPDATE total_all SET id = 1")
+
+    with op.batch_alter_table('total_day', schema=None) as batch_op:
+        batch_op.create_unique_constraint('uq_total_day_date', ['date'])
+
+    with op.batch_alter_table('total_month', schema=None) as batch_op:
+        batch_op.create_unique_constraint('uq_total_month_date', ['date'])
+
+
+def downgrade():
+    with op.batch_alter_table('total_month', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_total_month_date', type_='unique')
+
+    with op.batch_alter_table('total_day', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_total_day_date', type_='unique')
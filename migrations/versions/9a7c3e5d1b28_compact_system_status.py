@@ -0,0 +1,87 @@
+"""compact system_status into state-change intervals
+
+Revision ID: 9a7c3e5d1b28
+Revises: 4f9b1d2c8e60
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9a7c3e5d1b28'
+down_revision = '4f9b1d2c8e60'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+
+def upgrade():
+    with op.batch_alter_table('system_status', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('ended_at', sa.DateTime(), nullable=True))
+
+    op.create_table('current_status',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('status', sa.Integer(), nullable=False),
+    sa.Column('last_update', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+    # Recorrer la historia en orden y quedarse solo con los cambios de estado.
+    # Cada cambio cierra el intervalo anterior (ended_at).
+    connection = op.get_bind()
+    system_status = sa.table('system_status',
+        sa.column('id', sa.Integer),
+        sa.column('status', sa.Integer),
+        sa.column('last_update', sa.DateTime),
+        sa.column('ended_at', sa.DateTime)
+    )
+
+    rows = connection.execute(
+        sa.select(system_status.c.id, system_status.c.status, system_status.c.last_update)
+        .order_by(system_status.c.last_update, system_status.c.id)
+    )
+
+    kept = []       # (id, status, last_update) de los cambios de estado
+    redundant = []  # ids que repiten el estado anterior
+    last_row = None
+    while True:
+        batch = rows.fetchmany(BATCH_SIZE)
+        if not batch:
+            break
+        for row in batch:
+            if not kept or kept[-1][1] != row.status:
+                kept.append((row.id, row.status, row.last_update))
+            else:
+                redundant.append(row.id)
+            last_row = row
+
+    for i in range(0, len(redundant), BATCH_SIZE):
+        connection.execute(system_status.delete().where(system_status.c.id.in_(redundant[i:i + BATCH_SIZE])))
+
+    endings = [{'row_id': kept[i][0], 'ended': kept[i + 1][2]} for i in range(len(kept) - 1)]
+    if endings:
+        connection.execute(
+            system_status.update()
+            .where(system_status.c.id == sa.bindparam('row_id'))
+            .values(ended_at=sa.bindparam('ended')),
+            endings
+        )
+
+    if last_row is not None:
+        current_status = sa.table('current_status',
+            sa.column('id', sa.Integer),
+            sa.column('status', sa.Integer),
+            sa.column('last_update', sa.DateTime)
+        )
+        connection.execute(current_status.insert().values(id=1, status=last_row.status, last_update=last_row.last_update))
+
+
+def downgrade():
+    # Los heartbeats repetidos que se compactaron no se pueden recuperar
+    op.drop_table('current_status')
+
+    with op.batch_alter_table('system_status', schema=None) as batch_op:
+        batch_op.drop_column('ended_at')
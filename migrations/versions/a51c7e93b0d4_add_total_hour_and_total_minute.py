@@ -0,0 +1,59 @@
+"""add total_hour and total_minute
+
+Revision ID: a51c7e93b0d4
+Revises: 7d4e2a6b5c91
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a51c7e93b0d4'
+down_revision = '7d4e2a6b5c91'
+branch_labels = None
+depends_on = None
+
+
+# Inicio de la hora / minuto de wall_data.date. En SQLite con el mismo
+# texto que guarda SQLAlchemy para que coincida con las llaves del upsert.
+BUCKETS = {
+    'postgresql': {'total_hour': "date_trunc('hour', date)", 'total_minute': "date_trunc('minute', date)"},
+    'sqlite': {
+        'total_hour': "strftime('%Y-%m-%d %H:00:00.000000', date)",
+        'total_minute': "strftime('%Y-%m-%d %H:%M:00.000000', date)"
+    }
+}
+
+POWERS = [f'SUM(propeller{n} * propeller{n} / 216 * 1000)' for n in range(1, 6)]
+
+
+def upgrade():
+    for table in ('total_hour', 'total_minute'):
+        op.create_table(table,
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('date', sa.DateTime(), nullable=False),
+        sa.Column('propeller1', sa.Float(), nullable=False),
+        sa.Column('propeller2', sa.Float(), nullable=False),
+        sa.Column('propeller3', sa.Float(), nullable=False),
+        sa.Column('propeller4', sa.Float(), nullable=False),
+        sa.Column('propeller5', sa.Float(), nullable=False),
+        sa.Column('total', sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('date', name=f'uq_{table}_date')
+        )
+
+        # La historia que ya está en wall_data, así getAllHours y
+        # getAllMinutes solo leen estas tablas
+        bucket = BUCKETS[op.get_bind().dialect.name][table]
+        op.execute(f"""
+            INSERT INTO {table} (date, propeller1, propeller2, propeller3, propeller4, propeller5, total)
+            SELECT {bucket}, {', '.join(POWERS)}, {' + '.join(POWERS)}
+            FROM wall_data GROUP BY {bucket}
+        """)
+
+
+def downgrade():
+    op.drop_table('total_minute')
+    op.drop_table('total_hour')
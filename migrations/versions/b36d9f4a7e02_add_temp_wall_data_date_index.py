@@ -0,0 +1,23 @@
+"""add temp_wall_data date index
+
+Revision ID: b36d9f4a7e02
+Revises: 9a7c3e5d1b28
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'b36d9f4a7e02'
+down_revision = '9a7c3e5d1b28'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_temp_wall_data_date', 'temp_wall_data', ['date'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_temp_wall_data_date', table_name='temp_wall_data')
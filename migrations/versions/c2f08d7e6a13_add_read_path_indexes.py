@@ -0,0 +1,27 @@
+"""add read path indexes
+
+Revision ID: c2f08d7e6a13
+Revises: a51c7e93b0d4
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'c2f08d7e6a13'
+down_revision = 'a51c7e93b0d4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_wall_data_date', 'wall_data', ['date'], unique=False)
+    op.create_index('ix_temp_wall_data_group_id', 'temp_wall_data', ['group', 'id'], unique=False)
+    op.create_index('ix_system_status_last_update', 'system_status', ['last_update'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_system_status_last_update', table_name='system_status')
+    op.drop_index('ix_temp_wall_data_group_id', table_name='temp_wall_data')
+    op.drop_index('ix_wall_data_date', table_name='wall_data')
@@ -0,0 +1,40 @@
+"""add wall_data_rollup
+
+Revision ID: d14e7a0c9b35
+Revises: b36d9f4a7e02
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd14e7a0c9b35'
+down_revision = 'b36d9f4a7e02'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    columns = []
+    for i in range(1, 6):
+        for aggregate in ('sum', 'min', 'max'):
+            columns.append(sa.Column(f'propeller{i}_{aggregate}', sa.Float(), nullable=False))
+
+    op.create_table('wall_data_rollup',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('resolution', sa.String(length=8), nullable=False),
+    sa.Column('date', sa.DateTime(), nullable=False),
+    sa.Column('group', sa.Integer(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    *columns,
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('resolution', 'date', 'group', name='uq_wall_data_rollup')
+    )
+    op.create_index('ix_wall_data_rollup_date', 'wall_data_rollup', ['date'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_wall_data_rollup_date', table_name='wall_data_rollup')
+    op.drop_table('wall_data_rollup')
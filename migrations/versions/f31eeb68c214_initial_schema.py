@@ -0,0 +1,69 @@
+"""initial schema
+
+Revision ID: f31eeb68c214
+Revises: 
+Create Date: 2024-10-05 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f31eeb68c214'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('temp_wall_data',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('date', sa.DateTime(), nullable=False),
+    sa.Column('group', sa.Integer(), nullable=False),
+    sa.Column('propeller1', sa.Float(), nullable=False),
+    sa.Column('propeller2', sa.Float(), nullable=False),
+    sa.Column('propeller3', sa.Float(), nullable=False),
+    sa.Column('propeller4', sa.Float(), nullable=False),
+    sa.Column('propeller5', sa.Float(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('total_all',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('total', sa.Float(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('total_day',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('total', sa.Float(), nullable=False),
+    sa.Column('group1', sa.Float(), nullable=False),
+    sa.Column('group2', sa.Float(), nullable=False),
+    sa.Column('group3', sa.Float(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('total_month',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('total', sa.Float(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('wall_data',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('date', sa.DateTime(), nullable=False),
+    sa.Column('group', sa.Integer(), nullable=False),
+    sa.Column('propeller1', sa.Float(), nullable=False),
+    sa.Column('propeller2', sa.Float(), nullable=False),
+    sa.Column('propeller3', sa.Float(), nullable=False),
+    sa.Column('propeller4', sa.Float(), nullable=False),
+    sa.Column('propeller5', sa.Float(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade():
+    op.drop_table('wall_data')
+    op.drop_table('total_month')
+    op.drop_table('total_day')
+    op.drop_table('total_all')
+    op.drop_table('temp_wall_data')
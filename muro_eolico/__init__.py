@@ -0,0 +1,44 @@
+# -----------------------------------------------------------------------
+# MURO EÓLICO | API de la Pared Eólica para ASE II
+# -----------------------------------------------------------------------
+#   create_app() arma la aplicación. Importar el paquete no conecta a la
+#   base ni arranca hilos; lo pesado y opcional (Alembic, APScheduler,
+#   numpy, pyarrow) se importa hasta que se usa.
+
+import os
+
+import click
+from flask import Flask
+from flask_cors import CORS
+
+from . import metrics, profiling, scheduler
+from .config import SCHEDULER_MODE
+from .database import db, configure
+
+__all__ = ['create_app', 'db']
+
+def create_app(database_uri=None):
+    app = Flask(__name__)
+    CORS(app)
+    configure(app, database_uri or os.getenv('SQLALCHEMY_DATABASE_URI'))
+
+    metrics.init_app(app)
+    profiling.init_app(app)
+
+    from .routes import bp
+    app.register_blueprint(bp)
+
+    @app.before_request
+    def autostart_scheduler():
+        # Se arranca con la primera petición y no al importar, así el arranque
+        # de cada worker (y de cada cold start) no abre conexiones de más
+        if SCHEDULER_MODE == 'worker' and scheduler.scheduler is None:
+            scheduler.start_scheduler(app)
+
+    # Los comandos y Flask-Migrate solo hacen falta dentro de `flask ...`,
+    # que carga la app con un contexto de click activo
+    if click.get_current_context(silent=True) is not None:
+        from . import cli
+        cli.init_app(app)
+
+    return app
@@ -0,0 +1,388 @@
+# -----------------------------------------------------------------------
+# TOTALES | lecturas, agregados y estado de la Xiao
+# -----------------------------------------------------------------------
+#   Todo lo que escribe en las tablas de totales. Ninguna función hace
+#   commit, quien llama decide cuándo cerrar la transacción.
+
+import itertools
+import math
+from datetime import datetime, timedelta
+
+import pytz
+from sqlalchemy import func, extract
+
+from .config import PROPELLERS, logger
+from .database import db, dialect_insert, upsert_increment
+from .dates import mexico_tz, bucket_start
+from .models import (
+    WallData, TempWallData, TotalDay, TotalMonth, TotalAll, TotalHour, TotalMinute, TotalGroup,
+    WallDataRollup, DataVersion, SystemStatus, CurrentStatus
+)
+
+# Un total por debajo de esto ya no tiene lecturas detrás
+ZERO_TOTAL = 1e-6
+
+# WallData.group es db.Integer: INTEGER de 32 bits en PostgreSQL
+GROUP_MAX = 2 ** 31 - 1
+
+def bump_version(name):
+    # Sube la versión de un grupo de datos ('data' o 'status') dentro de la
+    # transacción actual. Los ETag se calculan con esta versión.
+    upsert_increment(DataVersion, {'name': name}, {'version': 1}, {'updated_at': datetime.now(pytz.utc).replace(tzinfo=None)})
+
+# -----------------------------------------------------------------------
+def update_total_day(today, total_sum, sum_group1, sum_group2, sum_group3):
+
+    # Crea el renglón de hoy o le suma los valores si ya existe
+    upsert_increment(
+        TotalDay,
+        {'date': today},
+        {'total': total_sum, 'group1': sum_group1, 'group2': sum_group2, 'group3': sum_group3}
+    )
+# -----------------------------------------------------------------------
+def update_total_month(month, total_sum):
+    # Ensure month is a datetime object and convert to Mexico City timezone
+    if isinstance(month, str):
+        month = datetime.strptime(month, '%Y-%m')
+    month = mexico_tz.localize(month)
+
+    # Use the first day of the month as the key
+    month_start = month.replace(day=1).date()
+
+    logger.debug('total_month month=%s total=%s', month_start, total_sum)
+
+    # Create the month row or add to it if it already exists
+    upsert_increment(TotalMonth, {'date': month_start}, {'total': total_sum})
+
+# -----------------------------------------------------------------------
+def update_total_all(total_sum):
+
+    # TotalAll siempre es un solo renglón con id = 1
+    upsert_increment(TotalAll, {'id': 1}, {'total': total_sum})
+
+# -----------------------------------------------------------------------
+def update_total_groups(group_totals):
+    # Suma (o resta, con valores negativos) a TotalGroup por grupo
+    for group, total in sorted(group_totals.items()):
+        upsert_increment(TotalGroup, {'group': group}, {'total': total})
+
+    # Un grupo al que se le borraron todas sus lecturas queda en cero (más
+    # el error de redondeo de restar flotantes): se quita para que
+    # get_totals no lo regrese
+    subtracted = sorted(group for group, total in group_totals.items() if total < 0)
+    if subtracted:
+        TotalGroup.query.filter(
+            TotalGroup.group.in_(subtracted), func.abs(TotalGroup.total) < ZERO_TOTAL
+        ).delete(synchronize_session=False)
+
+# -----------------------------------------------------------------------
+def propeller_power(value):
+    # Convierte la lectura de un propeller a potencia (p**2/216*1000).
+    # Sirve igual para un float o para una columna dentro de un query.
+    return value * value / 216 * 1000
+
+# -----------------------------------------------------------------------
+def power_sums(start, end, *fields):
+    # SUM de la potencia de cada propeller y del total en [start, end),
+    # agrupado por las partes de la fecha pedidas ('hour', 'minute').
+    # Regresa a lo más 24 o 60 renglones por hora/minuto.
+    parts = {'hour': WallData.hour_bucket % 100, 'minute': extract('minute', WallData.date)}
+    buckets = [parts[field].label(field) for field in fields]
+    powers = [propeller_power(getattr(WallData, propeller)) for propeller in PROPELLERS]
+
+    return (
+        db.session.query(
+            *buckets,
+            *[func.sum(power).label(propeller) for power, propeller in zip(powers, PROPELLERS)],
+            func.sum(sum(powers[1:], powers[0])).label('total')
+        )
+        .filter(WallData.date >= start, WallData.date < end)
+        .group_by(*buckets)
+        .all()
+    )
+
+# -----------------------------------------------------------------------
+def add_power(buckets, key, reading):
+    # Acumula la potencia de cada propeller y el total de una lectura
+    # en buckets[key] = [p1, p2, p3, p4, p5, total]
+    powers = [propeller_power(reading[propeller]) for propeller in PROPELLERS]
+    totals = buckets.setdefault(key, [0, 0, 0, 0, 0, 0])
+    for i, power in enumerate(powers):
+        totals[i] += power
+    totals[5] += sum(powers)
+
+# -----------------------------------------------------------------------
+def update_power_rollups(hour_totals, minute_totals):
+    # Suma los buckets de potencia en TotalHour y TotalMinute
+    for model, buckets in ((TotalHour, hour_totals), (TotalMinute, minute_totals)):
+        for bucket, totals in sorted(buckets.items()):
+            increments = dict(zip(PROPELLERS + ('total',), totals))
+            upsert_increment(model, {'date': bucket}, increments)
+
+# -----------------------------------------------------------------------
+def record_status(new_status):
+    # Actualiza el estado actual y solo agrega un renglón a la historia si
+    # el estado cambió. Regresa (CurrentStatus, cambió). No hace commit.
+    now = datetime.now(pytz.utc).replace(tzinfo=None)
+
+    # Crear el renglón con ON CONFLICT DO NOTHING y después bloquearlo:
+    # FOR UPDATE no bloquea un renglón que no existe, y dos primeros
+    # heartbeats al mismo tiempo chocaban en el INSERT (IntegrityError)
+    stmt = dialect_insert(CurrentStatus).values(id=1, status=new_status, last_update=now)
+    created = db.session.execute(stmt.on_conflict_do_nothing(index_elements=['id'])).rowcount == 1
+
+    current = CurrentStatus.query.filter_by(id=1).with_for_update().populate_existing().one()
+    changed = created or current.status != new_status
+    current.status = new_status
+    current.last_update = now
+
+    if changed:
+        # Cerrar el intervalo abierto y abrir uno nuevo
+        SystemStatus.query.filter(SystemStatus.ended_at.is_(None)).update({'ended_at': now}, synchronize_session=False)
+        new_log = SystemStatus(status=new_status)
+        new_log.last_update = now
+        db.session.add(new_log)
+        bump_version('status')
+
+    return current, changed
+
+# -----------------------------------------------------------------------
+def sync_current_status():
+    # Deja CurrentStatus igual al intervalo abierto después de editar la historia
+    open_log = SystemStatus.query.filter(SystemStatus.ended_at.is_(None)).order_by(SystemStatus.id.desc()).first()
+    current = db.session.get(CurrentStatus, 1)
+
+    if open_log is None:
+        if current is not None:
+            db.session.delete(current)
+    elif current is None:
+        db.session.add(CurrentStatus(status=open_log.status, last_update=open_log.last_update))
+    else:
+        current.status = open_log.status
+
+# -----------------------------------------------------------------------
+def parse_reading(data, default_date):
+    # Valida una lectura y regresa sus valores listos para guardar.
+    # Lanza ValueError con un mensaje legible si la lectura no es válida.
+    if not isinstance(data, dict):
+        raise ValueError('Reading must be a JSON object')
+
+    missing = [field for field in ('group',) + PROPELLERS if field not in data]
+    if missing:
+        raise ValueError(f"Missing fields: {', '.join(missing)}")
+
+    try:
+        reading = {propeller: float(data[propeller]) for propeller in PROPELLERS}
+        reading['group'] = int(data['group'])
+    except (TypeError, ValueError, OverflowError):
+        raise ValueError('Group and propeller values must be numeric')
+
+    # NaN pasa la revisión de MIN_TOTAL_SUM (toda comparación es falsa) y la
+    # base lo rechaza al guardar; infinito descompone todos los totales
+    if not all(math.isfinite(reading[propeller]) for propeller in PROPELLERS):
+        raise ValueError('Propeller values must be finite numbers')
+
+    if not 0 <= reading['group'] <= GROUP_MAX:
+        raise ValueError(f'Group must be between 0 and {GROUP_MAX}')
+
+    # La fecha del dispositivo es opcional, si no viene se usa la del servidor
+    if data.get('date') is None:
+        reading['date'] = default_date
+    else:
+        try:
+            reading['date'] = datetime.strptime(data['date'], '%Y-%m-%d %H:%M:%S')
+        except (TypeError, ValueError):
+            raise ValueError('Invalid date format. Use YYYY-MM-DD HH:MM:SS')
+
+    return reading
+
+# -----------------------------------------------------------------------
+def ingest_readings(readings):
+    # Inserta las lecturas y acumula los totales en memoria para actualizar
+    # TotalDay, TotalMonth, TotalAll, TotalHour y TotalMinute una sola vez
+    # por fecha. No hace commit, quien llama cierra la transacción.
+    new_rows = []
+    day_totals = {}
+    month_totals = {}
+    hour_totals = {}
+    minute_totals = {}
+    group_totals = {}
+    grand_total = 0
+
+    for reading in readings:
+        new_wall_data = WallData(**reading)
+        new_rows.append(new_wall_data)
+        db.session.add(new_wall_data)
+        db.session.add(TempWallData(**reading))
+
+        total_sum = sum(reading[propeller] for propeller in PROPELLERS)
+        sum_group1 = reading['propeller1'] + reading['propeller2']
+        sum_group2 = reading['propeller3']
+        sum_group3 = reading['propeller4'] + reading['propeller5']
+
+        day = reading['date'].date()
+        totals = day_totals.setdefault(day, [0, 0, 0, 0])
+        totals[0] += total_sum
+        totals[1] += sum_group1
+        totals[2] += sum_group2
+        totals[3] += sum_group3
+
+        month = reading['date'].strftime('%Y-%m')
+        month_totals[month] = month_totals.get(month, 0) + total_sum
+        grand_total += total_sum
+        group_totals[reading['group']] = group_totals.get(reading['group'], 0) + total_sum
+
+        minute = reading['date'].replace(second=0, microsecond=0)
+        add_power(hour_totals, minute.replace(minute=0), reading)
+        add_power(minute_totals, minute, reading)
+
+    if not new_rows:
+        return new_rows
+
+    # Siempre en el mismo orden (tabla y luego llave) para que dos lotes de
+    # varios días bloqueen los renglones igual y no haya deadlocks en PostgreSQL
+    for day, totals in sorted(day_totals.items()):
+        update_total_day(day, *totals)
+
+    for month, total in sorted(month_totals.items()):
+        update_total_month(month, total)
+
+    update_total_all(grand_total)
+    update_total_groups(group_totals)
+
+    update_power_rollups(hour_totals, minute_totals)
+
+    db.session.flush()
+    return new_rows
+
+# -----------------------------------------------------------------------
+def subtract_aggregates(*conditions):
+    # Antes de borrar WallData: resta de TotalDay, TotalMonth, TotalAll,
+    # TotalHour, TotalMinute y TotalGroup lo que suman los renglones que
+    # cumplen conditions. Un solo GROUP BY por grupo y minuto, el resto se
+    # junta en memoria. No hace commit, va en la transacción del borrado.
+    buckets = [WallData.hour_bucket, extract('minute', WallData.date).label('minute')]
+
+    rows = (
+        db.session.query(
+            WallData.group,
+            *buckets,
+            *[func.sum(getattr(WallData, propeller)).label(propeller) for propeller in PROPELLERS],
+            *[func.sum(propeller_power(getattr(WallData, propeller))).label(propeller + '_power') for propeller in PROPELLERS]
+        )
+        .filter(*conditions)
+        .group_by(WallData.group, *buckets)
+        .all()
+    )
+    if not rows:
+        return
+
+    day_totals = {}
+    month_totals = {}
+    hour_totals = {}
+    minute_totals = {}
+    group_totals = {}
+    grand_total = 0
+
+    for row in rows:
+        values = row._asdict()
+        minute = bucket_start(row.hour_bucket, row.minute)
+        total_sum = sum(values[propeller] for propeller in PROPELLERS)
+
+        totals = day_totals.setdefault(minute.date(), [0, 0, 0, 0])
+        totals[0] -= total_sum
+        totals[1] -= values['propeller1'] + values['propeller2']
+        totals[2] -= values['propeller3']
+        totals[3] -= values['propeller4'] + values['propeller5']
+
+        month = minute.strftime('%Y-%m')
+        month_totals[month] = month_totals.get(month, 0) - total_sum
+        group_totals[row.group] = group_totals.get(row.group, 0) - total_sum
+        grand_total -= total_sum
+
+        powers = [values[propeller + '_power'] for propeller in PROPELLERS]
+        for bucket_totals, key in ((hour_totals, minute.replace(minute=0)), (minute_totals, minute)):
+            totals = bucket_totals.setdefault(key, [0, 0, 0, 0, 0, 0])
+            for i, power in enumerate(powers):
+                totals[i] -= power
+            totals[5] -= sum(powers)
+
+    # Mismo orden que ingest_readings
+    for day, totals in sorted(day_totals.items()):
+        update_total_day(day, *totals)
+
+    for month, total in sorted(month_totals.items()):
+        update_total_month(month, total)
+
+    update_total_all(grand_total)
+    update_total_groups(group_totals)
+
+    update_power_rollups(hour_totals, minute_totals)
+
+# -----------------------------------------------------------------------
+def rebuild_day_aggregates(day):
+    # Recalcula TotalDay, TotalHour y TotalMinute de un día desde WallData.
+    # TotalMonth y TotalAll reciben solo la diferencia con el TotalDay
+    # anterior, así no hay que recorrer el resto del mes. No hace commit.
+    next_day = day + timedelta(days=1)
+
+    previous = TotalDay.query.filter_by(date=day.date()).first()
+    previous_total = previous.total if previous else 0
+
+    totals = db.session.query(
+        func.count(WallData.id),
+        func.sum(sum(getattr(WallData, propeller) for propeller in PROPELLERS)),
+        func.sum(WallData.propeller1 + WallData.propeller2),
+        func.sum(WallData.propeller3),
+        func.sum(WallData.propeller4 + WallData.propeller5)
+    ).filter(WallData.date >= day, WallData.date < next_day).one()
+    count, total_sum = totals[0], totals[1] or 0
+
+    TotalDay.query.filter_by(date=day.date()).delete(synchronize_session=False)
+    TotalHour.query.filter(TotalHour.date >= day, TotalHour.date < next_day).delete(synchronize_session=False)
+    TotalMinute.query.filter(TotalMinute.date >= day, TotalMinute.date < next_day).delete(synchronize_session=False)
+
+    if count:
+        update_total_day(day.date(), *[value or 0 for value in totals[1:]])
+
+    difference = total_sum - previous_total
+    if difference:
+        update_total_month(day.strftime('%Y-%m'), difference)
+        update_total_all(difference)
+
+    hour_totals = {
+        day.replace(hour=int(row.hour)): list(row[1:])
+        for row in power_sums(day, next_day, 'hour')
+    }
+    minute_totals = {
+        day.replace(hour=int(row.hour), minute=int(row.minute)): list(row[2:])
+        for row in power_sums(day, next_day, 'hour', 'minute')
+    }
+    update_power_rollups(hour_totals, minute_totals)
+
+    return count
+
+# -----------------------------------------------------------------------
+def group_totals_from_data():
+    # Totales por grupo recalculados desde WallData más el nivel por hora
+    # de WallDataRollup (que tiene todo lo que ya se compactó)
+    totals = {}
+    raw = db.session.query(
+        WallData.group,
+        func.sum(sum(getattr(WallData, propeller) for propeller in PROPELLERS))
+    ).group_by(WallData.group)
+    downsampled = db.session.query(
+        WallDataRollup.group,
+        func.sum(sum(getattr(WallDataRollup, propeller + '_sum') for propeller in PROPELLERS))
+    ).filter(WallDataRollup.resolution == 'hour').group_by(WallDataRollup.group)
+
+    for group, total in itertools.chain(raw, downsampled):
+        totals[group] = totals.get(group, 0) + total
+    return totals
+
+def rebuild_group_totals():
+    # Reemplaza TotalGroup con group_totals_from_data(). TotalGroup no
+    # guarda cuánto aportó cada día, así que no se puede corregir solo un
+    # día como TotalMonth: se recalcula completo. No hace commit.
+    TotalGroup.query.delete(synchronize_session=False)
+    db.session.add_all(TotalGroup(group, total) for group, total in group_totals_from_data().items())
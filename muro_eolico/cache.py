@@ -0,0 +1,127 @@
+# -----------------------------------------------------------------------
+# CACHÉ | respuestas de los endpoints de totales
+# -----------------------------------------------------------------------
+
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+import pytz
+from flask import request, current_app, Response
+
+from .config import CACHE_TTL, CACHE_MAX_ENTRIES
+from .database import db
+from .models import DataVersion
+
+class TTLCache:
+    # Caché en memoria con expiración (TTL) y desalojo LRU.
+    # Cada entrada guarda las tablas de las que depende (tags) para poder
+    # invalidar solo lo que cambió. Es por proceso: en otros workers una
+    # entrada vieja dura a lo más CACHE_TTL segundos.
+
+    def __init__(self, ttl, max_entries):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # key -> (expires, tags, value)
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self.entries[key]
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def set(self, key, value, tags):
+        if self.ttl <= 0:
+            return
+
+        with self.lock:
+            self.entries[key] = (time.monotonic() + self.ttl, frozenset(tags), value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, *tags):
+        # Borra las entradas que dependen de alguna de las tablas dadas
+        tags = set(tags)
+        with self.lock:
+            stale = [key for key, entry in self.entries.items() if entry[1] & tags]
+            for key in stale:
+                del self.entries[key]
+            self.invalidations += len(stale)
+
+    def stats(self):
+        with self.lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'size': len(self.entries),
+                'maxEntries': self.max_entries,
+                'ttl': self.ttl
+            }
+
+response_cache = TTLCache(CACHE_TTL, CACHE_MAX_ENTRIES)
+
+# Tablas que cambian con cada lectura nueva
+INGEST_TAGS = ('wall_data', 'total_day', 'total_month', 'total_all')
+
+def cached(*tags):
+    # Guarda la respuesta del endpoint, la llave es el endpoint con sus
+    # parámetros y los tags son las tablas que lee
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            key = (request.endpoint, tuple(sorted(kwargs.items())), tuple(sorted(request.args.items(multi=True))))
+
+            entry = response_cache.get(key)
+            if entry is not None:
+                data, status, mimetype = entry
+                return Response(data, status=status, mimetype=mimetype)
+
+            response = current_app.make_response(view(*args, **kwargs))
+            if response.status_code == 200:
+                response_cache.set(key, (response.get_data(), response.status_code, response.mimetype), tags)
+            return response
+        return wrapper
+    return decorator
+
+def conditional(name):
+    # ETag / Last-Modified a partir de DataVersion. Si el cliente manda un
+    # If-None-Match que coincide se responde 304 sin tocar las tablas de
+    # totales ni serializar nada.
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            data_version = db.session.get(DataVersion, name)
+            version = data_version.version if data_version else 0
+            etag = f'{name}-{version}'
+
+            if request.if_none_match.contains(etag):
+                response = Response(status=304)
+            else:
+                response = current_app.make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag)
+            response.headers['Cache-Control'] = 'no-cache'
+            if data_version:
+                response.last_modified = data_version.updated_at.replace(tzinfo=pytz.utc)
+            return response
+        return wrapper
+    return decorator
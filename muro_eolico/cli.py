@@ -0,0 +1,89 @@
+# -----------------------------------------------------------------------
+# COMANDOS | `flask ...` para mantenimiento
+# -----------------------------------------------------------------------
+#   create_app() solo registra estos comandos y Flask-Migrate cuando corre
+#   dentro del CLI de flask, así Alembic no se importa al servir peticiones.
+
+from datetime import timedelta
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+
+from .aggregates import bump_version, power_sums, update_power_rollups, group_totals_from_data
+from .cache import response_cache
+from .database import db
+from .jobs import downsample_wall_data
+from .models import TotalHour, TotalMinute, TotalGroup
+from .scheduler import start_scheduler
+
+@click.command('backfill-rollups')
+@with_appcontext
+@click.option('--from', 'date_from', type=click.DateTime(formats=['%Y-%m-%d']), required=True, help='Primer día (YYYY-MM-DD)')
+@click.option('--to', 'date_to', type=click.DateTime(formats=['%Y-%m-%d']), required=True, help='Último día incluido (YYYY-MM-DD)')
+def backfill_rollups(date_from, date_to):
+    """Recalcula TotalHour y TotalMinute desde WallData, un día a la vez."""
+    day = date_from
+    while day <= date_to:
+        next_day = day + timedelta(days=1)
+
+        TotalHour.query.filter(TotalHour.date >= day, TotalHour.date < next_day).delete(synchronize_session=False)
+        TotalMinute.query.filter(TotalMinute.date >= day, TotalMinute.date < next_day).delete(synchronize_session=False)
+
+        hour_totals = {
+            day.replace(hour=int(row.hour)): list(row[1:])
+            for row in power_sums(day, next_day, 'hour')
+        }
+        minute_totals = {
+            day.replace(hour=int(row.hour), minute=int(row.minute)): list(row[2:])
+            for row in power_sums(day, next_day, 'hour', 'minute')
+        }
+
+        update_power_rollups(hour_totals, minute_totals)
+        db.session.commit()
+
+        click.echo(f"{day.strftime('%Y-%m-%d')}: {len(hour_totals)} hours, {len(minute_totals)} minutes")
+        day = next_day
+
+@click.command('reconcile')
+@with_appcontext
+@click.option('--dry-run', is_flag=True, help='Solo reporta la diferencia, no corrige TotalGroup')
+def reconcile(dry_run):
+    """Recalcula TotalGroup desde los datos y reporta la diferencia."""
+    expected = group_totals_from_data()
+    stored = {row.group: row.total for row in TotalGroup.query.all()}
+
+    drift = 0
+    for group in sorted(set(expected) | set(stored)):
+        difference = stored.get(group, 0) - expected.get(group, 0)
+        if abs(difference) > 1e-6:
+            drift += 1
+        click.echo(f'group {group}: stored {stored.get(group, 0)}, expected {expected.get(group, 0)}, drift {difference}')
+
+    if not dry_run and drift:
+        TotalGroup.query.delete()
+        db.session.add_all(TotalGroup(group, total) for group, total in expected.items())
+        bump_version('data')
+        db.session.commit()
+        response_cache.invalidate('wall_data')
+
+    click.echo(f"{drift} groups with drift{'' if dry_run or not drift else ', fixed'}")
+
+@click.command('downsample')
+@with_appcontext
+def downsample():
+    """Compacta y borra ahora las lecturas fuera de RAW_RETENTION_DAYS."""
+    click.echo(f'{downsample_wall_data()} WallData rows downsampled')
+
+@click.command('run-scheduler')
+@with_appcontext
+def run_scheduler():
+    """Corre las tareas programadas en primer plano (proceso dedicado)."""
+    start_scheduler(current_app._get_current_object(), blocking=True)
+
+def init_app(app):
+    from flask_migrate import Migrate
+
+    Migrate(app, db)
+    for command in (backfill_rollups, reconcile, downsample, run_scheduler):
+        app.cli.add_command(command)
@@ -0,0 +1,126 @@
+# -----------------------------------------------------------------------
+# CONFIGURACIÓN | variables de entorno y constantes
+# -----------------------------------------------------------------------
+#   Todo se lee una vez al importar. Solo depende de la biblioteca
+#   estándar para que importar la configuración no cueste nada.
+
+import logging
+import os
+import tempfile
+
+# Pool de conexiones. DB_POOL_MODE = 'queue' (por omisión) mantiene un pool
+# por proceso de DB_POOL_SIZE + DB_MAX_OVERFLOW conexiones: con gunicorn el
+# máximo es workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW). 'null' abre y cierra
+# una conexión por petición, para Vercel (cada cold start es un proceso
+# nuevo) o cuando hay un pooler externo como PgBouncer.
+DB_POOL_MODE = os.getenv('DB_POOL_MODE', 'queue')
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 5))
+DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', 5))
+DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', 10))
+DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', 1800))
+DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', '1') == '1'
+
+# PostgreSQL: segundos para conectar, nombre en pg_stat_activity y límite
+# por consulta (0 = sin límite). El límite va como parámetro de arranque;
+# detrás de PgBouncer requiere ignore_startup_parameters = options.
+DB_CONNECT_TIMEOUT = int(os.getenv('DB_CONNECT_TIMEOUT', 5))
+DB_APPLICATION_NAME = os.getenv('DB_APPLICATION_NAME', 'muro_eolico')
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv('DB_STATEMENT_TIMEOUT_MS', 0))
+
+# Réplica de lectura: si está definida los GET leen de ella y todo lo
+# demás (escrituras, tareas programadas, CLI) va a la primaria
+SQLALCHEMY_REPLICA_URI = os.getenv('SQLALCHEMY_REPLICA_URI')
+
+BASE_URL = '/api/v1'
+
+PROPELLERS = ('propeller1', 'propeller2', 'propeller3', 'propeller4', 'propeller5')
+
+# Lecturas con una suma menor a esto no se guardan
+MIN_TOTAL_SUM = 0.2
+
+# Máximo de lecturas aceptadas por /newBatch
+BATCH_MAX_SIZE = int(os.getenv('BATCH_MAX_SIZE', 1000))
+
+# Paginación y streaming de los endpoints que regresan listas
+PAGE_MAX_LIMIT = int(os.getenv('PAGE_MAX_LIMIT', 5000))
+STREAM_BATCH_SIZE = int(os.getenv('STREAM_BATCH_SIZE', 1000))
+
+# Renglones por lote en /export
+EXPORT_BATCH_SIZE = int(os.getenv('EXPORT_BATCH_SIZE', 50000))
+
+
+# /analytics: máximo de lecturas por petición y potencia nominal de un
+# propeller para el factor de capacidad (0 = no se calcula)
+ANALYTICS_MAX_ROWS = int(os.getenv('ANALYTICS_MAX_ROWS', 5000000))
+RATED_POWER = float(os.getenv('RATED_POWER', 0))
+
+# Máximo de días que recalcula /rebuildAggregates en una petición
+REBUILD_MAX_DAYS = int(os.getenv('REBUILD_MAX_DAYS', 92))
+
+# Caché de los endpoints de totales (segundos, 0 lo desactiva)
+CACHE_TTL = float(os.getenv('CACHE_TTL', 5))
+CACHE_MAX_ENTRIES = int(os.getenv('CACHE_MAX_ENTRIES', 256))
+
+# Logs: DEBUG, INFO, WARNING (por omisión) o ERROR. Los mensajes son
+# "evento llave=valor" y solo se formatean si el nivel está activo.
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'WARNING').upper()
+
+# /metrics y la medición de cada petición y consulta (0 lo desactiva)
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', '1') == '1'
+
+# Perfiles de peticiones lentas. PROFILE_MODE = 'off' (por omisión), 'all'
+# perfila todas las peticiones o 'token' solo las que traen PROFILE_TOKEN en
+# el header X-Profile-Token o en ?profile_token=. Se guardan las que tardan
+# más de PROFILE_THRESHOLD_MS, a lo más PROFILE_MAX_FILES en PROFILE_DIR.
+PROFILE_MODE = os.getenv('PROFILE_MODE', 'off')
+PROFILE_TOKEN = os.getenv('PROFILE_TOKEN', '')
+PROFILE_THRESHOLD_MS = float(os.getenv('PROFILE_THRESHOLD_MS', 500))
+PROFILE_DIR = os.getenv('PROFILE_DIR', os.path.join(tempfile.gettempdir(), 'muro_eolico_profiles'))
+PROFILE_MAX_FILES = int(os.getenv('PROFILE_MAX_FILES', 50))
+
+logger = logging.getLogger('muro_eolico')
+logger.setLevel(LOG_LEVEL)
+if not logger.handlers:
+    log_handler = logging.StreamHandler()
+    log_handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s %(message)s'))
+    logger.addHandler(log_handler)
+
+# Tareas programadas. SCHEDULER_MODE = 'worker' las arranca con la primera
+# petición de cada proceso (solo uno las ejecuta gracias al lease), 'off'
+# no las arranca y se usa un proceso aparte con `flask run-scheduler`.
+# En Vercel (variable VERCEL) el proceso muere al terminar la petición,
+# así que por omisión no se arrancan.
+SCHEDULER_MODE = os.getenv('SCHEDULER_MODE', 'off' if os.getenv('VERCEL') else 'worker')
+
+# Cada cuánto se revisa la Xiao y cuánto tiempo sin señal la marca offline
+MONITOR_INTERVAL = int(os.getenv('MONITOR_INTERVAL', 60))
+MONITOR_TIMEOUT = int(os.getenv('MONITOR_TIMEOUT', 180))
+
+# Ingesta de /new. 'sync' guarda antes de responder, 'async' encola la
+# lectura, responde 202 y un hilo la guarda por lotes.
+INGEST_MODE = os.getenv('INGEST_MODE', 'sync')
+INGEST_QUEUE_SIZE = int(os.getenv('INGEST_QUEUE_SIZE', 10000))
+INGEST_FLUSH_INTERVAL = float(os.getenv('INGEST_FLUSH_INTERVAL', 1))
+INGEST_FLUSH_BATCH = int(os.getenv('INGEST_FLUSH_BATCH', 500))
+INGEST_MAX_RETRIES = int(os.getenv('INGEST_MAX_RETRIES', 5))
+
+# TempWallData solo guarda la ventana reciente (siempre queda la última
+# lectura de cada grupo). Se poda cada TEMP_PRUNE_INTERVAL segundos.
+TEMP_RETENTION_MINUTES = int(os.getenv('TEMP_RETENTION_MINUTES', 60))
+TEMP_PRUNE_INTERVAL = int(os.getenv('TEMP_PRUNE_INTERVAL', 300))
+TEMP_PRUNE_BATCH = int(os.getenv('TEMP_PRUNE_BATCH', 5000))
+
+# Retención de WallData. Las lecturas con más de RAW_RETENTION_DAYS días se
+# compactan por minuto y por hora en WallDataRollup y se borran. El nivel por
+# minuto se borra después de MINUTE_RETENTION_DAYS y queda el de horas.
+# 0 desactiva cada nivel (se guarda todo para siempre).
+RAW_RETENTION_DAYS = int(os.getenv('RAW_RETENTION_DAYS', 0))
+MINUTE_RETENTION_DAYS = int(os.getenv('MINUTE_RETENTION_DAYS', 0))
+DOWNSAMPLE_INTERVAL = int(os.getenv('DOWNSAMPLE_INTERVAL', 3600))
+DOWNSAMPLE_BATCH = int(os.getenv('DOWNSAMPLE_BATCH', 10000))
+
+# Particiones mensuales de wall_data y temp_wall_data (solo PostgreSQL).
+# La migración las crea si WALLDATA_PARTITIONING = 1 al correr `flask db upgrade`.
+WALLDATA_PARTITIONING = os.getenv('WALLDATA_PARTITIONING', '0') == '1'
+PARTITION_MONTHS_AHEAD = int(os.getenv('PARTITION_MONTHS_AHEAD', 3))
+PARTITION_INTERVAL = int(os.getenv('PARTITION_INTERVAL', 86400))
@@ -0,0 +1,98 @@
+# -----------------------------------------------------------------------
+# CONEXIONES | pool, opciones del driver y réplica de lectura
+# -----------------------------------------------------------------------
+#   db se crea sin app; create_app() le pasa la configuración con
+#   db.init_app(). Las opciones de cada engine salen de config.py.
+
+from flask import request, has_request_context
+from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import NullPool
+
+from .config import (
+    DB_POOL_MODE, DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE, DB_POOL_PRE_PING,
+    DB_CONNECT_TIMEOUT, DB_APPLICATION_NAME, DB_STATEMENT_TIMEOUT_MS, SQLALCHEMY_REPLICA_URI
+)
+
+def engine_options(uri):
+    # Opciones de create_engine para uri según DB_POOL_MODE y el driver
+    url = make_url(uri)
+    options = {}
+
+    if DB_POOL_MODE == 'null':
+        options['poolclass'] = NullPool
+    else:
+        options['pool_pre_ping'] = DB_POOL_PRE_PING
+        options['pool_recycle'] = DB_POOL_RECYCLE
+        # SQLite en archivo no necesita tamaños y en memoria no los acepta
+        if url.get_backend_name() != 'sqlite':
+            options['pool_size'] = DB_POOL_SIZE
+            options['max_overflow'] = DB_MAX_OVERFLOW
+            options['pool_timeout'] = DB_POOL_TIMEOUT
+
+    if url.get_backend_name() == 'postgresql':
+        connect_args = {
+            'connect_timeout': DB_CONNECT_TIMEOUT,
+            'application_name': DB_APPLICATION_NAME,
+            # Detecta conexiones muertas (NAT, failover) sin esperar al TCP
+            'keepalives': 1,
+            'keepalives_idle': 30,
+            'keepalives_interval': 10,
+            'keepalives_count': 3
+        }
+        if DB_STATEMENT_TIMEOUT_MS:
+            connect_args['options'] = f'-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}'
+        # psycopg2 no usa prepared statements del servidor. psycopg 3 los
+        # crea solo tras varias ejecuciones y se rompen con PgBouncer en
+        # modo transacción, así que con un pooler externo se desactivan.
+        if url.get_driver_name() == 'psycopg' and DB_POOL_MODE == 'null':
+            connect_args['prepare_threshold'] = None
+        options['connect_args'] = connect_args
+
+    return options
+
+def use_replica():
+    # Solo las peticiones de lectura. Los hilos de tareas e ingesta y los
+    # comandos no tienen petición y siempre usan la primaria.
+    return 'replica' in db.engines and has_request_context() and request.method in ('GET', 'HEAD')
+
+class RoutingSession(Session):
+    # La sesión es por petición (Flask-SQLAlchemy la cierra al terminar el
+    # app context), así que toda la petición queda en un solo engine
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and use_replica():
+            return self._db.engines['replica']
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+db = SQLAlchemy(session_options={'class_': RoutingSession})
+
+def configure(app, uri):
+    # Conexión primaria y, si está definida, la réplica como bind 'replica'
+    app.config['SQLALCHEMY_DATABASE_URI'] = uri
+    if uri:
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(uri)
+    if SQLALCHEMY_REPLICA_URI:
+        app.config['SQLALCHEMY_BINDS'] = {'replica': {'url': SQLALCHEMY_REPLICA_URI, **engine_options(SQLALCHEMY_REPLICA_URI)}}
+    db.init_app(app)
+
+def dialect_insert(model):
+    # INSERT con soporte de ON CONFLICT para PostgreSQL o SQLite
+    insert = postgresql.insert if db.session.get_bind().dialect.name == 'postgresql' else sqlite.insert
+    return insert(model.__table__)
+
+def upsert_increment(model, keys, increments, values=None):
+    # INSERT ... ON CONFLICT (llaves) DO UPDATE SET col = col + excluded.col
+    # Una sola sentencia atómica, no se pierden incrementos entre workers.
+    # Las columnas en values se sobrescriben en lugar de sumarse.
+    # No hace commit, quien llama decide cuándo cerrar la transacción.
+    values = values or {}
+    table = model.__table__
+
+    stmt = dialect_insert(model).values(**keys, **increments, **values)
+    set_ = {column: table.c[column] + stmt.excluded[column] for column in increments}
+    set_.update({column: stmt.excluded[column] for column in values})
+
+    stmt = stmt.on_conflict_do_update(index_elements=list(keys), set_=set_)
+    db.session.execute(stmt)
@@ -0,0 +1,37 @@
+# -----------------------------------------------------------------------
+# FECHAS | hora de México y buckets de día / hora
+# -----------------------------------------------------------------------
+#   WallData guarda la hora local de México sin tzinfo, los estados y
+#   leases guardan UTC.
+
+from datetime import datetime
+from functools import lru_cache
+
+import pytz
+
+mexico_tz = pytz.timezone('America/Mexico_City')
+
+@lru_cache(maxsize=1024)
+def local_offset(utc_hour):
+    # Diferencia UTC -> México para una hora UTC. Los cambios de horario
+    # son en punto, así que basta con calcularla una vez por hora.
+    return pytz.utc.localize(utc_hour).astimezone(mexico_tz).utcoffset()
+
+def format_datetime(value):
+    # 'YYYY-MM-DD HH:MM:SS', igual que strftime('%Y-%m-%d %H:%M:%S') pero en C
+    return value.isoformat(' ', 'seconds')
+
+def format_local(utc_value):
+    # Fecha UTC guardada sin tzinfo -> texto en hora de México
+    if utc_value.tzinfo is not None:
+        utc_value = utc_value.astimezone(pytz.utc).replace(tzinfo=None)
+    return format_datetime(utc_value + local_offset(utc_value.replace(minute=0, second=0, microsecond=0)))
+
+def hour_bucket(value):
+    # Hora local como entero YYYYMMDDHH
+    return value.year * 1000000 + value.month * 10000 + value.day * 100 + value.hour
+
+def bucket_start(hour, minute=0):
+    # Inicio de la hora (y minuto) de un hour_bucket
+    hour, minute = int(hour), int(minute)
+    return datetime(hour // 1000000, hour // 10000 % 100, hour // 100 % 100, hour % 100, minute)
@@ -0,0 +1,190 @@
+# -----------------------------------------------------------------------
+# EXPORTAR | WallData en CSV o binario columnar y arreglos para /analytics
+# -----------------------------------------------------------------------
+#   numpy (en requirements.txt) y pyarrow (opcional) son pesados de
+#   importar: se cargan con la primera petición que los usa y no en cada
+#   arranque (cold start). Si faltan, el endpoint responde 501.
+
+import csv
+import importlib
+import io
+import struct
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+from sqlalchemy import select
+
+from .config import PROPELLERS, EXPORT_BATCH_SIZE
+from .database import db
+from .dates import format_datetime
+from .jobs import downsampled_query
+from .metrics import counted_batches
+from .models import WallData, WallDataRollup
+
+EPOCH = datetime(1970, 1, 1)
+
+# count es cuántas lecturas resume el renglón y resolution los segundos que
+# cubre (0 = lectura cruda). En los datos compactados cada propeller es la
+# suma del bucket, así sumar una columna da lo mismo que con las crudas.
+EXPORT_COLUMNS = ('id', 'date', 'group') + PROPELLERS + ('count', 'resolution')
+
+RESOLUTION_SECONDS = {'minute': 60, 'hour': 3600}
+
+@lru_cache(maxsize=None)
+def optional_import(name):
+    # El módulo o None si no está instalado
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
+
+def analytics_arrays(start, end):
+    # Lee date, group y p1..p5 del rango en lotes y los junta en arreglos
+    # de NumPy sin construir objetos del ORM
+    numpy = optional_import('numpy')
+    stmt = select(WallData.date, WallData.group, *[getattr(WallData, propeller) for propeller in PROPELLERS]).where(
+        WallData.date >= start, WallData.date < end
+    ).execution_options(yield_per=EXPORT_BATCH_SIZE)
+
+    dates, groups, readings = [], [], []
+    for batch in counted_batches(db.session.execute(stmt).partitions()):
+        columns = list(zip(*batch))
+        dates.append(numpy.array(columns[0], dtype='datetime64[us]'))
+        groups.append(numpy.array(columns[1], dtype=numpy.int64))
+        readings.append(numpy.column_stack([numpy.array(column, dtype=numpy.float64) for column in columns[2:]]))
+
+    if not dates:
+        return numpy.array([], dtype='datetime64[us]'), numpy.array([], dtype=numpy.int64), numpy.empty((0, len(PROPELLERS)))
+    return numpy.concatenate(dates), numpy.concatenate(groups), numpy.concatenate(readings)
+
+def export_batches(start, end):
+    # Lotes de tuplas con EXPORT_COLUMNS sin construir objetos del ORM.
+    # Primero van los datos compactados (id None, suma de cada propeller).
+    downsampled = downsampled_query(start, end).with_entities(
+        db.null(),
+        WallDataRollup.date,
+        WallDataRollup.group,
+        *[getattr(WallDataRollup, propeller + '_sum') for propeller in PROPELLERS],
+        WallDataRollup.count,
+        db.case(*[(WallDataRollup.resolution == name, seconds) for name, seconds in RESOLUTION_SECONDS.items()])
+    ).statement.execution_options(yield_per=EXPORT_BATCH_SIZE)
+
+    stmt = (
+        select(
+            WallData.id, WallData.date, WallData.group, *[getattr(WallData, propeller) for propeller in PROPELLERS],
+            db.literal(1), db.literal(0)
+        )
+        .order_by(WallData.id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+    if start is not None:
+        stmt = stmt.where(WallData.date >= start)
+    if end is not None:
+        stmt = stmt.where(WallData.date < end)
+
+    # Las consultas se ejecutan hasta que se pide el primer lote, ya dentro
+    # del streaming: el cursor del servidor (yield_per en PostgreSQL) no
+    # sobrevive al final de la transacción de la vista
+    for statement in (downsampled, stmt):
+        yield from counted_batches(db.session.execute(statement).partitions())
+
+def export_csv(batches):
+    yield ','.join(EXPORT_COLUMNS) + '\r\n'
+    for batch in batches:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerows((row[0], format_datetime(row[1]), *row[2:]) for row in batch)
+        yield buffer.getvalue()
+
+def export_frames(batches):
+    # Formato propio sin dependencias: b'WDF2' y luego frames columnares.
+    # Cada frame es '<I' (n renglones) seguido de las columnas completas,
+    # todo little-endian: id n*int64, date n*int64 (segundos desde 1970 de
+    # la hora local guardada), group n*int32, propeller1..5 n*float64,
+    # count n*int32 y resolution n*int32. Un frame con n = 0 marca el
+    # final. Los datos compactados llevan id 0.
+    yield b'WDF2'
+    for batch in batches:
+        n = len(batch)
+        columns = list(zip(*batch))
+        dates = [int((date - EPOCH).total_seconds()) for date in columns[1]]
+        yield b''.join([
+            struct.pack('<I', n),
+            struct.pack(f'<{n}q', *[row_id or 0 for row_id in columns[0]]),
+            struct.pack(f'<{n}q', *dates),
+            struct.pack(f'<{n}i', *columns[2]),
+            *[struct.pack(f'<{n}d', *column) for column in columns[3:8]],
+            *[struct.pack(f'<{n}i', *column) for column in columns[8:]]
+        ])
+    yield struct.pack('<I', 0)
+
+def export_arrow(batches):
+    # Arrow IPC stream, un record batch por lote
+    import pyarrow
+    import pyarrow.ipc
+
+    schema = pyarrow.schema(
+        [('id', pyarrow.int64()), ('date', pyarrow.timestamp('s')), ('group', pyarrow.int32())]
+        + [(propeller, pyarrow.float64()) for propeller in PROPELLERS]
+        + [('count', pyarrow.int32()), ('resolution', pyarrow.int32())]
+    )
+    sink = io.BytesIO()
+    writer = pyarrow.ipc.new_stream(sink, schema)
+
+    def flush():
+        data = sink.getvalue()
+        sink.seek(0)
+        sink.truncate()
+        return data
+
+    yield flush()
+    for batch in batches:
+        columns = list(zip(*batch))
+        writer.write_batch(pyarrow.record_batch(
+            [pyarrow.array(column, type=field.type) for column, field in zip(columns, schema)],
+            schema=schema
+        ))
+        yield flush()
+    writer.close()
+    yield flush()
+
+def export_npy(batches, count):
+    # .npy necesita el número de renglones en el encabezado, se cuenta antes.
+    # Si llegan menos renglones de los contados se rellena con ceros.
+    # Los datos compactados llevan id 0.
+    import numpy
+    import numpy.lib.format
+
+    dtype = numpy.dtype(
+        [('id', '<i8'), ('date', '<M8[s]'), ('group', '<i4')]
+        + [(propeller, '<f8') for propeller in PROPELLERS]
+        + [('count', '<i4'), ('resolution', '<i4')]
+    )
+    header = io.BytesIO()
+    numpy.lib.format.write_array_header_1_0(header, {
+        'descr': numpy.lib.format.dtype_to_descr(dtype),
+        'fortran_order': False,
+        'shape': (count,)
+    })
+    yield header.getvalue()
+
+    remaining = count
+    for batch in batches:
+        batch = batch[:remaining]
+        remaining -= len(batch)
+        yield numpy.array([(row[0] or 0, *row[1:]) for row in batch], dtype=dtype).tobytes()
+        if remaining == 0:
+            break
+    if remaining:
+        yield numpy.zeros(remaining, dtype=dtype).tobytes()
+
+def parse_export_date(value, is_end):
+    # Acepta YYYY-MM-DD o YYYY-MM-DD HH:MM:SS. Un 'to' con solo fecha
+    # incluye el día completo.
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, '%Y-%m-%d %H:%M:%S')
+    except ValueError:
+        day = datetime.strptime(value, '%Y-%m-%d')
+        return day + timedelta(days=1) if is_end else day
@@ -0,0 +1,144 @@
+# -----------------------------------------------------------------------
+# INGESTA ASÍNCRONA | cola en memoria para /new con INGEST_MODE = 'async'
+# -----------------------------------------------------------------------
+
+import atexit
+import queue
+import threading
+import time
+
+from flask import current_app
+
+from .aggregates import bump_version, ingest_readings
+from .cache import response_cache, INGEST_TAGS
+from .config import INGEST_MODE, INGEST_FLUSH_INTERVAL, INGEST_FLUSH_BATCH, INGEST_MAX_RETRIES, INGEST_QUEUE_SIZE, logger
+from .database import db
+
+class IngestQueue:
+    # Cola acotada de lecturas ya validadas. Un hilo la vacía cada
+    # INGEST_FLUSH_INTERVAL segundos (o al juntar INGEST_FLUSH_BATCH) y
+    # guarda cada lote en una sola transacción con ingest_readings().
+    # Si la cola se llena /new responde 429 para frenar a los dispositivos.
+
+    def __init__(self, maxsize):
+        self.queue = queue.Queue(maxsize)
+        self.lock = threading.Lock()
+        self.thread = None
+        self.app = None
+        self.enqueued = 0
+        self.rejected = 0
+        self.flushed = 0
+        self.dropped = 0
+        self.last_flush_ms = None
+        self.last_flush_size = 0
+
+    def put(self, reading):
+        # Regresa False si la cola está llena
+        self.start()
+        try:
+            self.queue.put_nowait(reading)
+        except queue.Full:
+            with self.lock:
+                self.rejected += 1
+            return False
+
+        with self.lock:
+            self.enqueued += 1
+        return True
+
+    def start(self):
+        # El hilo se crea con la primera lectura, no al importar, y guarda
+        # la app de esa petición para abrir su propio app context
+        with self.lock:
+            if self.thread is not None:
+                return
+            self.app = current_app._get_current_object()
+            self.thread = threading.Thread(target=self.run, name='ingest-flusher', daemon=True)
+            self.thread.start()
+        atexit.register(self.drain)
+
+    def take_batch(self, timeout):
+        try:
+            batch = [self.queue.get(timeout=timeout)]
+        except queue.Empty:
+            return []
+
+        while len(batch) < INGEST_FLUSH_BATCH:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def run(self):
+        while True:
+            batch = self.take_batch(INGEST_FLUSH_INTERVAL)
+            if batch:
+                self.flush(batch)
+
+    def drain(self):
+        # Al apagar el proceso se guarda lo que quede en la cola
+        while True:
+            batch = self.take_batch(0.01)
+            if not batch:
+                return
+            self.flush(batch)
+
+    def save(self, batch):
+        # Un intento de guardar el lote. Regresa el error o None si se guardó
+        with self.app.app_context():
+            try:
+                ingest_readings(batch)
+                bump_version('data')
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                return e
+
+        response_cache.invalidate(*INGEST_TAGS)
+        return None
+
+    def flush(self, batch):
+        started = time.perf_counter()
+        for attempt in range(INGEST_MAX_RETRIES):
+            if attempt:
+                time.sleep(min(2 ** (attempt - 1), 30))
+            error = self.save(batch)
+            if error is None:
+                with self.lock:
+                    self.flushed += len(batch)
+                    self.last_flush_size = len(batch)
+                    self.last_flush_ms = round((time.perf_counter() - started) * 1000, 3)
+                return
+            logger.warning('ingest_flush_failed size=%d attempt=%d error=%s', len(batch), attempt + 1, error)
+
+        # Un lote que falla en todos los intentos casi siempre trae una
+        # lectura que la base no acepta: se guardan una por una para que
+        # solo se pierda esa y no las demás, que ya se respondieron con 202
+        saved = 0
+        for reading in batch:
+            error = self.save([reading]) if len(batch) > 1 else error
+            if error is None:
+                saved += 1
+            else:
+                logger.error('ingest_reading_dropped reading=%r error=%s', reading, error)
+
+        with self.lock:
+            self.flushed += saved
+            self.dropped += len(batch) - saved
+
+    def stats(self):
+        with self.lock:
+            return {
+                'mode': INGEST_MODE,
+                'depth': self.queue.qsize(),
+                'maxDepth': self.queue.maxsize,
+                'enqueued': self.enqueued,
+                'rejected': self.rejected,
+                'flushed': self.flushed,
+                'dropped': self.dropped,
+                'lastFlushMs': self.last_flush_ms,
+                'lastFlushSize': self.last_flush_size
+            }
+
+ingest_queue = IngestQueue(INGEST_QUEUE_SIZE)
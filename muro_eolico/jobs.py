@@ -0,0 +1,275 @@
+# -----------------------------------------------------------------------
+# TAREAS | particiones, retención de datos y monitoreo de la Xiao
+# -----------------------------------------------------------------------
+#   Cada función con @scheduled_job corre en un solo proceso gracias al
+#   lease. Las rutas solo usan downsampled_query() y raw_cutoff().
+
+import re
+from datetime import date, datetime, timedelta
+
+import pytz
+from sqlalchemy import func, extract, text
+
+from .aggregates import bump_version, record_status
+from .cache import response_cache
+from .config import (
+    PROPELLERS, WALLDATA_PARTITIONING, PARTITION_MONTHS_AHEAD, PARTITION_INTERVAL,
+    TEMP_RETENTION_MINUTES, TEMP_PRUNE_INTERVAL, TEMP_PRUNE_BATCH,
+    RAW_RETENTION_DAYS, MINUTE_RETENTION_DAYS, DOWNSAMPLE_INTERVAL, DOWNSAMPLE_BATCH,
+    MONITOR_INTERVAL, MONITOR_TIMEOUT, logger
+)
+from .database import db, dialect_insert
+from .dates import mexico_tz, bucket_start
+from .models import WallData, TempWallData, WallDataRollup, CurrentStatus
+from .scheduler import scheduled_job, renew_lease
+
+PARTITIONED_TABLES = {'wall_data': WallData, 'temp_wall_data': TempWallData}
+
+def partitioning_enabled():
+    return WALLDATA_PARTITIONING and db.session.get_bind().dialect.name == 'postgresql'
+
+def add_months(month_start, months):
+    month = month_start.month - 1 + months
+    return month_start.replace(year=month_start.year + month // 12, month=month % 12 + 1, day=1)
+
+def list_partitions(table):
+    # Particiones mensuales de una tabla: [(nombre, inicio, fin)] ordenadas
+    rows = db.session.execute(text("""
+        SELECT child.relname FROM pg_inherits
+        JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE parent.relname = :table
+    """), {'table': table})
+
+    partitions = []
+    for (name,) in rows:
+        match = re.fullmatch(rf'{table}_p(\d{{4}})_(\d{{2}})', name)
+        if match:
+            start = date(int(match.group(1)), int(match.group(2)), 1)
+            partitions.append((name, start, add_months(start, 1)))
+    return sorted(partitions, key=lambda partition: partition[1])
+
+def ensure_partitions(table, first_month, last_month):
+    # Crea las particiones que falten entre first_month y last_month.
+    # /newBatch acepta cualquier fecha del dispositivo, así que un mes puede
+    # tener ya lecturas en la partición default; PostgreSQL no deja crear la
+    # partición encima de ellas. Se crea la tabla suelta, se le pasan esas
+    # lecturas y se adjunta, todo en la transacción de quien llama.
+    existing = {start for _, start, _ in list_partitions(table)}
+    columns = ', '.join(f'"{column.name}"' for column in PARTITIONED_TABLES[table].__table__.columns)
+
+    month = first_month.replace(day=1)
+    while month <= last_month:
+        if month not in existing:
+            name = f"{table}_p{month.strftime('%Y_%m')}"
+            bounds = f"FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+            db.session.execute(text(f'CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS)'))
+            moved = db.session.execute(text(f'''
+                WITH moved AS (
+                    DELETE FROM {table}_default
+                    WHERE date >= '{month.isoformat()}' AND date < '{add_months(month, 1).isoformat()}'
+                    RETURNING {columns}
+                )
+                INSERT INTO {name} ({columns}) SELECT {columns} FROM moved
+            ''')).rowcount
+            db.session.execute(text(f'ALTER TABLE {table} ATTACH PARTITION {name} FOR VALUES {bounds}'))
+            if moved:
+                logger.info('partition_rows_moved table=%s partition=%s rows=%d', table, name, moved)
+        month = add_months(month, 1)
+
+@scheduled_job('create_partitions', PARTITION_INTERVAL)
+def create_partitions():
+    # Deja listas las particiones de los próximos PARTITION_MONTHS_AHEAD meses
+    if not partitioning_enabled():
+        return
+
+    this_month = datetime.now(mexico_tz).date().replace(day=1)
+    for table in PARTITIONED_TABLES:
+        ensure_partitions(table, this_month, add_months(this_month, PARTITION_MONTHS_AHEAD))
+    db.session.commit()
+
+@scheduled_job('prune_temp_wall_data', TEMP_PRUNE_INTERVAL)
+def prune_temp_wall_data():
+    # Borra por lotes las lecturas de TempWallData más viejas que
+    # TEMP_RETENTION_MINUTES, sin tocar la última de cada grupo
+    cutoff = datetime.now(mexico_tz).replace(tzinfo=None) - timedelta(minutes=TEMP_RETENTION_MINUTES)
+    latest_ids = db.session.query(func.max(TempWallData.id)).group_by(TempWallData.group)
+
+    deleted = 0
+    while True:
+        ids = [row[0] for row in db.session.query(TempWallData.id).filter(
+            TempWallData.date < cutoff,
+            TempWallData.id.notin_(latest_ids)
+        ).limit(TEMP_PRUNE_BATCH).all()]
+
+        if not ids:
+            break
+
+        deleted += TempWallData.query.filter(TempWallData.id.in_(ids)).delete(synchronize_session=False)
+        db.session.commit()
+        if not renew_lease():
+            return deleted
+
+    # Con particiones, las de meses pasados que ya quedaron vacías se borran
+    if partitioning_enabled():
+        this_month = datetime.now(mexico_tz).date().replace(day=1)
+        for name, start, end in list_partitions('temp_wall_data'):
+            if end <= this_month and not db.session.execute(text(f'SELECT EXISTS (SELECT 1 FROM {name})')).scalar():
+                db.session.execute(text(f'DROP TABLE {name}'))
+        db.session.commit()
+
+    return deleted
+
+# -----------------------------------------------------------------------
+def raw_cutoff():
+    # Inicio del primer día que todavía se guarda completo en WallData
+    today = datetime.now(mexico_tz).date()
+    return datetime.combine(today - timedelta(days=RAW_RETENTION_DAYS), datetime.min.time())
+
+def minute_cutoff():
+    # Antes de esta fecha solo queda el nivel por hora (None = sin límite)
+    if MINUTE_RETENTION_DAYS <= 0:
+        return None
+    today = datetime.now(mexico_tz).date()
+    return datetime.combine(today - timedelta(days=MINUTE_RETENTION_DAYS), datetime.min.time())
+
+def downsampled_query(start=None, end=None):
+    # Renglones compactados que reemplazan a WallData en rangos viejos:
+    # por minuto mientras existan y por hora antes de minute_cutoff()
+    cutoff = minute_cutoff()
+    if cutoff is None:
+        query = WallDataRollup.query.filter(WallDataRollup.resolution == 'minute')
+    else:
+        query = WallDataRollup.query.filter(db.or_(
+            db.and_(WallDataRollup.resolution == 'hour', WallDataRollup.date < cutoff),
+            db.and_(WallDataRollup.resolution == 'minute', WallDataRollup.date >= cutoff)
+        ))
+
+    if start is not None:
+        query = query.filter(WallDataRollup.date >= start)
+    if end is not None:
+        query = query.filter(WallDataRollup.date < end)
+    return query.order_by(WallDataRollup.date, WallDataRollup.group)
+
+def merge_rollup(resolution, date, group, values):
+    # Suma un bucket a WallDataRollup, combinando min/max si ya existía
+    table = WallDataRollup.__table__
+    postgres = db.session.get_bind().dialect.name == 'postgresql'
+    least = func.least if postgres else func.min
+    greatest = func.greatest if postgres else func.max
+
+    stmt = dialect_insert(WallDataRollup).values(resolution=resolution, date=date, group=group, **values)
+    set_ = {'count': table.c.count + stmt.excluded.count}
+    for propeller in PROPELLERS:
+        set_[propeller + '_sum'] = table.c[propeller + '_sum'] + stmt.excluded[propeller + '_sum']
+        set_[propeller + '_min'] = least(table.c[propeller + '_min'], stmt.excluded[propeller + '_min'])
+        set_[propeller + '_max'] = greatest(table.c[propeller + '_max'], stmt.excluded[propeller + '_max'])
+
+    db.session.execute(stmt.on_conflict_do_update(index_elements=['resolution', 'date', 'group'], set_=set_))
+
+def rollup_buckets(conditions, resolution):
+    # count/sum/min/max por grupo y minuto u hora de las lecturas que cumplen conditions
+    buckets = [WallData.hour_bucket]
+    if resolution == 'minute':
+        buckets.append(extract('minute', WallData.date).label('minute'))
+
+    aggregates = [func.count(WallData.id).label('count')]
+    for propeller in PROPELLERS:
+        column = getattr(WallData, propeller)
+        aggregates += [
+            func.sum(column).label(propeller + '_sum'),
+            func.min(column).label(propeller + '_min'),
+            func.max(column).label(propeller + '_max')
+        ]
+
+    rows = db.session.query(WallData.group, *buckets, *aggregates).filter(*conditions).group_by(WallData.group, *buckets)
+    for row in rows:
+        values = row._asdict()
+        date = bucket_start(values.pop('hour_bucket'), values.pop('minute', 0))
+        group = values.pop('group')
+        yield date, group, values
+
+@scheduled_job('downsample_wall_data', DOWNSAMPLE_INTERVAL)
+def downsample_wall_data():
+    # Compacta y borra WallData más vieja que RAW_RETENTION_DAYS, de
+    # DOWNSAMPLE_BATCH renglones por transacción: el resumen y el borrado
+    # del mismo lote van juntos, así que cortar a la mitad no duplica nada
+    if RAW_RETENTION_DAYS <= 0:
+        return 0
+
+    cutoff = raw_cutoff()
+    moved = 0
+
+    # Con particiones, los meses completos antes del corte se compactan y
+    # se borran con DROP TABLE en lugar de un DELETE grande
+    if partitioning_enabled():
+        for name, start, end in list_partitions('wall_data'):
+            if end > cutoff.date():
+                break
+
+            conditions = (WallData.date >= start, WallData.date < end)
+            for resolution in ('minute', 'hour'):
+                for bucket, group, values in rollup_buckets(conditions, resolution):
+                    merge_rollup(resolution, bucket, group, values)
+
+            moved += db.session.execute(text(f'SELECT count(*) FROM {name}')).scalar()
+            db.session.execute(text(f'DROP TABLE {name}'))
+            bump_version('data')
+            db.session.commit()
+            response_cache.invalidate('wall_data')
+            if not renew_lease():
+                return moved
+
+    while True:
+        old_ids = db.session.query(WallData.id).filter(WallData.date < cutoff).order_by(WallData.id).limit(DOWNSAMPLE_BATCH).subquery()
+        upper_id = db.session.query(func.max(old_ids.c.id)).scalar()
+        if upper_id is None:
+            break
+
+        conditions = (WallData.date < cutoff, WallData.id <= upper_id)
+        for resolution in ('minute', 'hour'):
+            for bucket, group, values in rollup_buckets(conditions, resolution):
+                merge_rollup(resolution, bucket, group, values)
+
+        moved += WallData.query.filter(*conditions).delete(synchronize_session=False)
+        bump_version('data')
+        db.session.commit()
+        response_cache.invalidate('wall_data')
+        if not renew_lease():
+            return moved
+
+    # El nivel por minuto también tiene su retención
+    expired = minute_cutoff()
+    while expired is not None:
+        ids = [row[0] for row in db.session.query(WallDataRollup.id).filter(
+            WallDataRollup.resolution == 'minute',
+            WallDataRollup.date < expired
+        ).limit(DOWNSAMPLE_BATCH).all()]
+        if not ids:
+            break
+        WallDataRollup.query.filter(WallDataRollup.id.in_(ids)).delete(synchronize_session=False)
+        db.session.commit()
+        if not renew_lease():
+            return moved
+
+    return moved
+
+@scheduled_job('monitor_xiao_status', MONITOR_INTERVAL)
+def monitor_xiao_status():
+    # Se ejecuta cada MONITOR_INTERVAL segundos en un solo proceso
+    latest_status = db.session.get(CurrentStatus, 1)
+    
+    if latest_status:
+        now = datetime.now(pytz.utc)  # Ahora en UTC
+        last_update = latest_status.last_update.replace(tzinfo=pytz.utc)  # Asegurar que tenga UTC
+
+        logger.debug('xiao_heartbeat last_update=%s now=%s', last_update, now)
+
+        # Si pasa MONITOR_TIMEOUT sin recibir un 1, guardar un 0
+        if latest_status.status == 1 and (now - last_update) > timedelta(seconds=MONITOR_TIMEOUT):
+            logger.warning('xiao_timeout seconds=%d last_update=%s', MONITOR_TIMEOUT, last_update)
+
+            record_status(0)
+            db.session.commit()
+
+            logger.info('xiao_status_changed status=0 reason=inactivity')
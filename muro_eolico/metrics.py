@@ -0,0 +1,154 @@
+# -----------------------------------------------------------------------
+# MÉTRICAS | /metrics en formato de texto de Prometheus
+# -----------------------------------------------------------------------
+
+import threading
+import time
+
+from flask import request, g, has_request_context, Response, stream_with_context
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .config import METRICS_ENABLED
+
+class Metrics:
+    # Contadores e histogramas en memoria con etiquetas. Son por proceso,
+    # igual que la caché: Prometheus suma los de cada worker.
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.descriptions = {}  # nombre -> (tipo, ayuda, buckets)
+        self.values = {}  # (nombre, etiquetas) -> número o [conteos..., suma, total]
+
+    def describe(self, name, kind, help_text, buckets=None):
+        self.descriptions[name] = (kind, help_text, buckets)
+
+    def inc(self, name, labels=(), value=1):
+        with self.lock:
+            self.values[(name, labels)] = self.values.get((name, labels), 0) + value
+
+    def observe(self, name, labels, value):
+        buckets = self.descriptions[name][2]
+        with self.lock:
+            data = self.values.get((name, labels))
+            if data is None:
+                data = self.values[(name, labels)] = [0] * (len(buckets) + 2)
+            for i, bound in enumerate(buckets):
+                if value <= bound:
+                    data[i] += 1
+            data[-2] += value
+            data[-1] += 1
+
+    def render(self):
+        def label_text(labels, extra=()):
+            pairs = [f'{key}="{value}"' for key, value in labels + extra]
+            return '{' + ','.join(pairs) + '}' if pairs else ''
+
+        with self.lock:
+            values = sorted(self.values.items(), key=lambda item: item[0])
+            values = [(key, list(value) if isinstance(value, list) else value) for key, value in values]
+
+        lines = []
+        for name, (kind, help_text, buckets) in sorted(self.descriptions.items()):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            for (metric, labels), value in values:
+                if metric != name:
+                    continue
+                if kind == 'histogram':
+                    for bound, count in zip(buckets, value):
+                        lines.append(f'{name}_bucket{label_text(labels, (("le", bound),))} {count}')
+                    lines.append(f'{name}_bucket{label_text(labels, (("le", "+Inf"),))} {value[-1]}')
+                    lines.append(f'{name}_sum{label_text(labels)} {value[-2]}')
+                    lines.append(f'{name}_count{label_text(labels)} {value[-1]}')
+                else:
+                    lines.append(f'{name}{label_text(labels)} {value}')
+        return '\n'.join(lines) + '\n'
+
+metrics = Metrics()
+metrics.describe('http_request_duration_seconds', 'histogram', 'Request time per route, including streamed bodies',
+                 (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10))
+metrics.describe('http_request_db_queries', 'histogram', 'SQL queries per request',
+                 (0, 1, 2, 5, 10, 20, 50, 100, 200))
+metrics.describe('db_queries_total', 'counter', 'SQL statements executed')
+metrics.describe('db_query_seconds_total', 'counter', 'Time spent in SQL statements')
+metrics.describe('db_rows_fetched_total', 'counter', 'Rows read by list, export and analytics endpoints')
+metrics.describe('ingest_readings_total', 'counter', 'Readings received by /new and /newBatch by result')
+
+def streamed_response(body, **kwargs):
+    # Response con stream_with_context que avisa cuando terminó de enviarse
+    g.streaming = True
+
+    def closing():
+        try:
+            yield from body
+        finally:
+            g.stream_closed = True
+
+    return Response(stream_with_context(closing()), **kwargs)
+
+def request_finished(exception=None):
+    # Con streamed_response teardown corre dos veces: al regresar la vista
+    # y al terminar de enviar el cuerpo. Solo la segunda cuenta.
+    return exception is not None or not g.get('streaming') or g.get('stream_closed', False)
+
+def metrics_route():
+    # Etiqueta de la petición actual: la regla de la ruta, no la URL, para
+    # no crear una serie por cada valor de los parámetros
+    if not has_request_context():
+        return 'background'
+    return request.url_rule.rule if request.url_rule is not None else 'unmatched'
+
+def count_rows(count):
+    if METRICS_ENABLED:
+        metrics.inc('db_rows_fetched_total', (('route', metrics_route()),), count)
+
+def counted_batches(batches):
+    # Pasa los lotes tal cual, contando sus renglones
+    for batch in batches:
+        count_rows(len(batch))
+        yield batch
+
+def count_readings(result, count=1):
+    if METRICS_ENABLED and count:
+        metrics.inc('ingest_readings_total', (('result', result),), count)
+
+if METRICS_ENABLED:
+    @event.listens_for(Engine, 'before_cursor_execute')
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+    @event.listens_for(Engine, 'after_cursor_execute')
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info['query_started'].pop()
+        labels = (('route', metrics_route()),)
+        metrics.inc('db_queries_total', labels)
+        metrics.inc('db_query_seconds_total', labels, elapsed)
+        if has_request_context() and 'request_started' in g:
+            g.request_queries += 1
+
+def init_app(app):
+    # Tiempo y número de consultas de cada petición
+    if not METRICS_ENABLED:
+        return
+
+    @app.before_request
+    def start_request_metrics():
+        g.request_started = time.perf_counter()
+        g.request_queries = 0
+
+    @app.after_request
+    def record_status_code(response):
+        g.request_status = response.status_code
+        return response
+
+    @app.teardown_request
+    def finish_request_metrics(exception=None):
+        if 'request_started' not in g or not request_finished(exception):
+            return
+        route = metrics_route()
+        status = 500 if exception is not None else g.get('request_status', 500)
+        metrics.observe('http_request_duration_seconds', (('method', request.method), ('route', route), ('status', str(status))),
+                        time.perf_counter() - g.request_started)
+        metrics.observe('http_request_db_queries', (('route', route),), g.request_queries)
+        del g.request_started
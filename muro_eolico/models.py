@@ -0,0 +1,408 @@
+# -----------------------------------------------------------------------
+# MODELOS
+# -----------------------------------------------------------------------
+
+from datetime import datetime
+
+import pytz
+
+from .config import PROPELLERS
+from .database import db
+from .dates import format_datetime, format_local, hour_bucket
+
+class TempWallData(db.Model):
+    # readTempLatest busca el último id de cada grupo y la poda busca por fecha
+    __table_args__ = (
+        db.Index('ix_temp_wall_data_group_id', 'group', 'id'),
+        db.Index('ix_temp_wall_data_date', 'date'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    date = db.Column(db.DateTime, nullable=False)
+    group = db.Column(db.Integer, nullable=False)
+    propeller1 = db.Column(db.Float, nullable=False)
+    propeller2 = db.Column(db.Float, nullable=False)
+    propeller3 = db.Column(db.Float, nullable=False)
+    propeller4 = db.Column(db.Float, nullable=False)
+    propeller5 = db.Column(db.Float, nullable=False)
+
+    def __init__(self, date, group, propeller1, propeller2, propeller3, propeller4, propeller5):    
+        self.date = date
+        self.group = group
+        self.propeller1 = propeller1
+        self.propeller2 = propeller2
+        self.propeller3 = propeller3
+        self.propeller4 = propeller4
+        self.propeller5 = propeller5
+
+    def to_json(self):
+        return {
+            'id': self.id,  # Siempre es buena idea incluir el id también
+            'date': format_datetime(self.date),
+            'group': self.group,
+            'propeller1': self.propeller1,
+            'propeller2': self.propeller2,
+            'propeller3': self.propeller3,
+            'propeller4': self.propeller4,
+            'propeller5': self.propeller5,
+        }
+
+    def __repr__(self):
+        return '<TempWallData %r>' % self.propeller1
+
+
+class WallData(db.Model):
+    # Todas las consultas por rango de fechas usan este índice
+    __table_args__ = (db.Index('ix_wall_data_date', 'date'),)
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    date = db.Column(db.DateTime, nullable=False)
+    group = db.Column(db.Integer, nullable=False)
+    propeller1 = db.Column(db.Float, nullable=False)
+    propeller2 = db.Column(db.Float, nullable=False)
+    propeller3 = db.Column(db.Float, nullable=False)
+    propeller4 = db.Column(db.Float, nullable=False)
+    propeller5 = db.Column(db.Float, nullable=False)
+    # Hora local de date ya calculada (YYYYMMDDHH) para agrupar sin
+    # extraer partes de la fecha en cada consulta
+    hour_bucket = db.Column(db.Integer, nullable=False)
+
+    def __init__(self, date, group, propeller1, propeller2, propeller3, propeller4, propeller5):    
+        self.date = date
+        self.hour_bucket = hour_bucket(date)
+        self.group = group
+        self.propeller1 = propeller1
+        self.propeller2 = propeller2
+        self.propeller3 = propeller3
+        self.propeller4 = propeller4
+        self.propeller5 = propeller5
+
+    def to_json(self):
+        return {
+            'id': self.id,  # Siempre es buena idea incluir el id también
+            'date': format_datetime(self.date),
+            'group': self.group,
+            'propeller1': self.propeller1,
+            'propeller2': self.propeller2,
+            'propeller3': self.propeller3,
+            'propeller4': self.propeller4,
+            'propeller5': self.propeller5,
+        }
+
+    def __repr__(self):
+        return '<WallData %r>' % self.propeller1
+
+# -----------------------------------------------------------------------
+class TotalDay(db.Model):
+    __table_args__ = (db.UniqueConstraint('date', name='uq_total_day_date'),)
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    date = db.Column(db.Date, nullable=False)
+    total = db.Column(db.Float, nullable=False)
+    group1 = db.Column(db.Float, nullable=False)
+    group2 = db.Column(db.Float, nullable=False)
+    group3 = db.Column(db.Float, nullable=False)
+
+    def __init__(self, date, total, group1, group2, group3):
+        self.date = date
+        self.total = total
+        self.group1 = group1
+        self.group2 = group2
+        self.group3 = group3
+
+    def to_json(self):
+        return {
+            'id': self.id,
+            'date': self.date.strftime('%Y-%m-%d'),
+            'total': self.total,
+            'group1': self.group1,
+            'group2': self.group2,
+            'group3': self.group3
+        }
+
+    def __repr__(self):
+        return '<TotalDay %r>' % self.total
+
+# -----------------------------------------------------------------------
+class TotalMonth(db.Model):
+    __table_args__ = (db.UniqueConstraint('date', name='uq_total_month_date'),)
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    date = db.Column(db.Date, nullable=False)
+    total = db.Column(db.Float, nullable=False)
+
+    def __init__(self, date, total):
+        self.date = date
+        self.total = total
+
+    def to_json(self):
+        return {
+            'id': self.id,
+            'date': self.date.strftime('%Y-%m'),
+            'total': self.total
+        }
+
+    def __repr__(self):
+        return '<TotalMonth %r>' % self.total
+# -----------------------------------------------------------------------
+class TotalAll(db.Model):
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    total = db.Column(db.Float, nullable=False)
+
+    def __init__(self, total):
+        self.total = total
+
+    def to_json(self):
+        return {
+            'id': self.id,
+            'total': self.total
+        }
+
+    def __repr__(self):
+        return '<TotalAll %r>' % self.total
+
+# -----------------------------------------------------------------------
+class TotalHour(db.Model):
+    # Potencia por hora ya convertida (p**2/216*1000) de cada propeller,
+    # date es el inicio de la hora en hora local
+    __table_args__ = (db.UniqueConstraint('date', name='uq_total_hour_date'),)
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    date = db.Column(db.DateTime, nullable=False)
+    propeller1 = db.Column(db.Float, nullable=False)
+    propeller2 = db.Column(db.Float, nullable=False)
+    propeller3 = db.Column(db.Float, nullable=False)
+    propeller4 = db.Column(db.Float, nullable=False)
+    propeller5 = db.Column(db.Float, nullable=False)
+    total = db.Column(db.Float, nullable=False)
+
+    def __init__(self, date, propeller1, propeller2, propeller3, propeller4, propeller5, total):
+        self.date = date
+        self.propeller1 = propeller1
+        self.propeller2 = propeller2
+        self.propeller3 = propeller3
+        self.propeller4 = propeller4
+        self.propeller5 = propeller5
+        self.total = total
+
+    def to_json(self):
+        return {
+            'id': self.id,
+            'date': self.date.strftime('%Y-%m-%d %H:00:00'),
+            'propeller1': self.propeller1,
+            'propeller2': self.propeller2,
+            'propeller3': self.propeller3,
+            'propeller4': self.propeller4,
+            'propeller5': self.propeller5,
+            'total': self.total
+        }
+
+    def __repr__(self):
+        return '<TotalHour %r>' % self.total
+
+# -----------------------------------------------------------------------
+class TotalMinute(db.Model):
+    # Igual que TotalHour pero por minuto
+    __table_args__ = (db.UniqueConstraint('date', name='uq_total_minute_date'),)
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    date = db.Column(db.DateTime, nullable=False)
+    propeller1 = db.Column(db.Float, nullable=False)
+    propeller2 = db.Column(db.Float, nullable=False)
+    propeller3 = db.Column(db.Float, nullable=False)
+    propeller4 = db.Column(db.Float, nullable=False)
+    propeller5 = db.Column(db.Float, nullable=False)
+    total = db.Column(db.Float, nullable=False)
+
+    def __init__(self, date, propeller1, propeller2, propeller3, propeller4, propeller5, total):
+        self.date = date
+        self.propeller1 = propeller1
+        self.propeller2 = propeller2
+        self.propeller3 = propeller3
+        self.propeller4 = propeller4
+        self.propeller5 = propeller5
+        self.total = total
+
+    def to_json(self):
+        return {
+            'id': self.id,
+            'date': self.date.strftime('%Y-%m-%d %H:%M:00'),
+            'propeller1': self.propeller1,
+            'propeller2': self.propeller2,
+            'propeller3': self.propeller3,
+            'propeller4': self.propeller4,
+            'propeller5': self.propeller5,
+            'total': self.total
+        }
+
+    def __repr__(self):
+        return '<TotalMinute %r>' % self.total
+
+# -----------------------------------------------------------------------
+class TotalGroup(db.Model):
+    # Suma acumulada de p1..p5 por valor de la columna group de WallData
+    # (no es lo mismo que group1..group3 de TotalDay). Incluye lo compactado.
+    group = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    total = db.Column(db.Float, nullable=False)
+
+    def __init__(self, group, total):
+        self.group = group
+        self.total = total
+
+    def to_json(self):
+        return {
+            'group': self.group,
+            'total': self.total
+        }
+
+    def __repr__(self):
+        return '<TotalGroup %r %r>' % (self.group, self.total)
+
+# -----------------------------------------------------------------------
+class WallDataRollup(db.Model):
+    # Lecturas viejas de WallData compactadas por minuto o por hora
+    # (resolution) y grupo: cuántas eran y suma/mínimo/máximo de cada
+    # propeller. date es el inicio del minuto u hora en hora local.
+    __table_args__ = (
+        db.UniqueConstraint('resolution', 'date', 'group', name='uq_wall_data_rollup'),
+        db.Index('ix_wall_data_rollup_date', 'date'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    resolution = db.Column(db.String(8), nullable=False)  # 'minute' u 'hour'
+    date = db.Column(db.DateTime, nullable=False)
+    group = db.Column(db.Integer, nullable=False)
+    count = db.Column(db.Integer, nullable=False)
+    propeller1_sum = db.Column(db.Float, nullable=False)
+    propeller1_min = db.Column(db.Float, nullable=False)
+    propeller1_max = db.Column(db.Float, nullable=False)
+    propeller2_sum = db.Column(db.Float, nullable=False)
+    propeller2_min = db.Column(db.Float, nullable=False)
+    propeller2_max = db.Column(db.Float, nullable=False)
+    propeller3_sum = db.Column(db.Float, nullable=False)
+    propeller3_min = db.Column(db.Float, nullable=False)
+    propeller3_max = db.Column(db.Float, nullable=False)
+    propeller4_sum = db.Column(db.Float, nullable=False)
+    propeller4_min = db.Column(db.Float, nullable=False)
+    propeller4_max = db.Column(db.Float, nullable=False)
+    propeller5_sum = db.Column(db.Float, nullable=False)
+    propeller5_min = db.Column(db.Float, nullable=False)
+    propeller5_max = db.Column(db.Float, nullable=False)
+
+    def __init__(self, resolution, date, group, count, **aggregates):
+        self.resolution = resolution
+        self.date = date
+        self.group = group
+        self.count = count
+        for column, value in aggregates.items():
+            setattr(self, column, value)
+
+    def to_json(self):
+        # Mismo formato que WallData.to_json, con el promedio de cada
+        # propeller y sin id porque ya no es una lectura individual
+        data = {
+            'id': None,
+            'date': format_datetime(self.date),
+            'group': self.group,
+            'count': self.count,
+            'resolution': self.resolution
+        }
+        for propeller in PROPELLERS:
+            data[propeller] = getattr(self, propeller + '_sum') / self.count
+        return data
+
+    def __repr__(self):
+        return '<WallDataRollup %r %r>' % (self.resolution, self.date)
+
+# -----------------------------------------------------------------------
+class DataVersion(db.Model):
+    # Contador monotónico por grupo de datos para ETag / Last-Modified.
+    # 'data' cambia con WallData y los totales, 'status' con SystemStatus.
+    name = db.Column(db.String(32), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, nullable=False)  # UTC
+
+    def __init__(self, name, version, updated_at):
+        self.name = name
+        self.version = version
+        self.updated_at = updated_at
+
+    def to_json(self):
+        return {
+            'name': self.name,
+            'version': self.version,
+            'updatedAt': self.updated_at.strftime('%Y-%m-%d %H:%M:%S')
+        }
+
+    def __repr__(self):
+        return '<DataVersion %r %r>' % (self.name, self.version)
+
+# -----------------------------------------------------------------------
+class SchedulerLease(db.Model):
+    # Quién está ejecutando cada tarea programada y hasta cuándo.
+    # Solo el dueño de un lease vigente corre la tarea.
+    name = db.Column(db.String(64), primary_key=True)
+    owner = db.Column(db.String(128), nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False)  # UTC
+
+    def __init__(self, name, owner, expires_at):
+        self.name = name
+        self.owner = owner
+        self.expires_at = expires_at
+
+    def to_json(self):
+        return {
+            'name': self.name,
+            'owner': self.owner,
+            'expiresAt': self.expires_at.strftime('%Y-%m-%d %H:%M:%S')
+        }
+
+    def __repr__(self):
+        return '<SchedulerLease %r %r>' % (self.name, self.owner)
+
+class SystemStatus(db.Model):
+    # Historia de estados: un renglón por cada cambio de estado. El intervalo
+    # empieza en last_update y termina en ended_at (NULL si sigue abierto).
+    __table_args__ = (db.Index('ix_system_status_last_update', 'last_update'),)
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    status = db.Column(db.Integer, nullable=False, default=0)  # 0 = offline, 1 = online
+    last_update = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(pytz.utc))  # Guardar en UTC
+    ended_at = db.Column(db.DateTime, nullable=True)  # UTC
+
+    def __init__(self, status):
+        self.status = status
+        self.last_update = datetime.now(pytz.utc)  # Guardar en UTC
+
+    def to_json(self):
+        # Convertir la fecha UTC almacenada a la zona horaria de México antes de enviarla
+        last_update_mx = format_local(self.last_update)
+        return {
+            "id": self.id,
+            "status": self.status,
+            "lastUpdate": last_update_mx,
+            "start": last_update_mx,
+            "end": format_local(self.ended_at) if self.ended_at else None
+        }
+
+# -----------------------------------------------------------------------
+class CurrentStatus(db.Model):
+    # Último estado recibido, siempre un solo renglón con id = 1.
+    # Los heartbeats solo actualizan este renglón.
+    id = db.Column(db.Integer, primary_key=True)
+    status = db.Column(db.Integer, nullable=False)  # 0 = offline, 1 = online
+    last_update = db.Column(db.DateTime, nullable=False)  # UTC
+
+    def __init__(self, status, last_update):
+        self.id = 1
+        self.status = status
+        self.last_update = last_update
+
+    def to_json(self):
+        return {
+            "status": self.status,
+            "lastUpdate": format_local(self.last_update)
+        }
+
+    def __repr__(self):
+        return '<CurrentStatus %r>' % self.status
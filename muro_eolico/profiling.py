@@ -0,0 +1,100 @@
+# -----------------------------------------------------------------------
+# PERFILES | cProfile + SQL de las peticiones lentas
+# -----------------------------------------------------------------------
+
+import io
+import os
+import re
+import time
+from datetime import datetime
+
+import pytz
+from flask import request, g, has_request_context
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .config import PROFILE_MODE, PROFILE_TOKEN, PROFILE_THRESHOLD_MS, PROFILE_DIR, PROFILE_MAX_FILES, logger
+from .metrics import metrics_route, request_finished
+
+PROFILE_FILE = re.compile(r'\d{8}T\d{6}_\d{6}_[\w.-]+_\d+ms\.txt')
+
+def profile_token_ok():
+    # Sin PROFILE_TOKEN configurado no hay forma de pedir ni ver perfiles
+    token = request.headers.get('X-Profile-Token') or request.args.get('profile_token')
+    return bool(PROFILE_TOKEN) and token == PROFILE_TOKEN
+
+def write_profile(profiler, elapsed_ms, status, statements):
+    # Un archivo de texto por petición: datos de la petición, el SQL con su
+    # tiempo y las 40 funciones con más tiempo acumulado. Borra los más
+    # viejos si hay más de PROFILE_MAX_FILES.
+    import pstats
+
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    endpoint = request.endpoint or 'unmatched'
+    name = f"{datetime.now(pytz.utc).strftime('%Y%m%dT%H%M%S_%f')}_{endpoint}_{int(elapsed_ms)}ms.txt"
+
+    stats = io.StringIO()
+    pstats.Stats(profiler, stream=stats).sort_stats('cumulative').print_stats(40)
+
+    with open(os.path.join(PROFILE_DIR, name), 'w', encoding='utf-8') as file:
+        file.write(f'{request.method} {request.full_path}\n')
+        file.write(f'route={metrics_route()} status={status} elapsed_ms={elapsed_ms:.3f}\n\n')
+        file.write(f'SQL ({len(statements)} statements, {sum(ms for _, ms in statements):.3f} ms)\n')
+        for statement, ms in statements:
+            file.write(f'-- {ms:.3f} ms\n{statement}\n')
+        file.write('\n' + stats.getvalue())
+
+    files = sorted(file for file in os.listdir(PROFILE_DIR) if PROFILE_FILE.fullmatch(file))
+    for old in files[:max(0, len(files) - PROFILE_MAX_FILES)]:
+        os.remove(os.path.join(PROFILE_DIR, old))
+
+    logger.info('request_profiled file=%s elapsed_ms=%.3f', name, elapsed_ms)
+
+if PROFILE_MODE != 'off':
+    @event.listens_for(Engine, 'before_cursor_execute')
+    def before_profiled_execute(conn, cursor, statement, parameters, context, executemany):
+        if has_request_context() and 'profiler' in g:
+            conn.info.setdefault('profile_started', []).append(time.perf_counter())
+
+    @event.listens_for(Engine, 'after_cursor_execute')
+    def after_profiled_execute(conn, cursor, statement, parameters, context, executemany):
+        if has_request_context() and 'profiler' in g and conn.info.get('profile_started'):
+            g.profile_sql.append((statement, (time.perf_counter() - conn.info['profile_started'].pop()) * 1000))
+
+def init_app(app):
+    if PROFILE_MODE == 'off':
+        return
+
+    # Con PROFILE_MODE=off (lo normal) cProfile no se importa al arrancar
+    import cProfile
+
+    @app.before_request
+    def start_profile():
+        # Ver los perfiles no genera perfiles nuevos
+        if request.endpoint in ('api.list_profiles', 'api.get_profile'):
+            return
+        if PROFILE_MODE == 'all' or PROFILE_MODE == 'token' and profile_token_ok():
+            g.profile_sql = []
+            g.profile_started = time.perf_counter()
+            g.profiler = cProfile.Profile()
+            g.profiler.enable()
+
+    @app.after_request
+    def record_profile_status(response):
+        if 'profiler' in g:
+            g.profile_status = response.status_code
+        return response
+
+    @app.teardown_request
+    def finish_profile(exception=None):
+        if 'profiler' not in g or not request_finished(exception):
+            return
+
+        profiler = g.pop('profiler')
+        profiler.disable()
+        elapsed_ms = (time.perf_counter() - g.profile_started) * 1000
+        if elapsed_ms >= PROFILE_THRESHOLD_MS:
+            try:
+                write_profile(profiler, elapsed_ms, 500 if exception is not None else g.get('profile_status', 500), g.profile_sql)
+            except OSError:
+                logger.exception('profile_write_failed')
@@ -0,0 +1,773 @@
+# -----------------------------------------------------------------------
+# RUTAS | todos los endpoints HTTP en el blueprint 'api'
+# -----------------------------------------------------------------------
+
+import os
+from datetime import datetime, timedelta
+
+from flask import Blueprint, request, abort, jsonify, Response
+from sqlalchemy import func
+
+from .aggregates import (
+    bump_version, propeller_power, record_status, sync_current_status,
+    parse_reading, ingest_readings, subtract_aggregates, rebuild_day_aggregates, rebuild_group_totals
+)
+from .cache import response_cache, INGEST_TAGS, cached, conditional
+from .config import (
+    BASE_URL, PROPELLERS, MIN_TOTAL_SUM, BATCH_MAX_SIZE, ANALYTICS_MAX_ROWS, RATED_POWER, REBUILD_MAX_DAYS,
+    METRICS_ENABLED, PROFILE_MODE, PROFILE_DIR, INGEST_MODE, INGEST_FLUSH_INTERVAL, RAW_RETENTION_DAYS, logger
+)
+from .database import db
+from .dates import mexico_tz
+from .exports import (
+    optional_import, analytics_arrays, export_batches, export_csv, export_frames, export_arrow, export_npy,
+    parse_export_date
+)
+from .ingest import ingest_queue
+from .jobs import downsampled_query, raw_cutoff
+from .metrics import metrics, count_readings, streamed_response
+from .models import (
+    WallData, TempWallData, TotalDay, TotalMonth, TotalAll, TotalHour, TotalMinute, TotalGroup,
+    WallDataRollup, SystemStatus, CurrentStatus
+)
+from .profiling import PROFILE_FILE, profile_token_ok
+from .serialization import list_response
+
+bp = Blueprint('api', __name__)
+
+# --- MAIN -------------------------------------------------------------
+@bp.route('/')
+def index():
+    return "Welcome to my ORM app!"
+ 
+# ---POST---------------------------------------------------------------
+
+@bp.route(BASE_URL + '/new', methods=['POST'])
+def create():
+
+    # Definir la fecha de hoy (hora local de México, sin tzinfo)
+    date = datetime.now(mexico_tz).replace(tzinfo=None, microsecond=0) # Fecha que irá en WallData
+
+    logger.debug('reading_received date=%s', date)
+    # Obtener los datos del request
+    data = request.get_json(silent=True)
+
+    if not data or 'propeller1' not in data:
+        count_readings('invalid')
+        abort(400)
+
+    else:
+        # La fecha siempre la pone el servidor en este endpoint
+        data = {key: value for key, value in data.items() if key != 'date'}
+
+        try:
+            reading = parse_reading(data, date)
+        except ValueError:
+            count_readings('invalid')
+            abort(400)
+
+        # Sacar el total generado para actualizar los demás
+        total_sum = sum(reading[propeller] for propeller in PROPELLERS)
+
+        if total_sum >= MIN_TOTAL_SUM and INGEST_MODE == 'async':
+            # Se guarda después, en el siguiente lote del hilo de ingesta
+            if not ingest_queue.put(reading):
+                count_readings('queue_full')
+                response = jsonify({'error': 'Ingest queue is full, retry later'})
+                response.headers['Retry-After'] = str(max(1, int(INGEST_FLUSH_INTERVAL)))
+                return response, 429
+
+            count_readings('accepted')
+            return jsonify({'message': 'Reading queued', 'queued': ingest_queue.queue.qsize()}), 202
+
+        elif total_sum >= MIN_TOTAL_SUM:
+            # Guardar el objeto y actualizar TotalDay, TotalMonth y TotalAll
+            new_wall_data = ingest_readings([reading])[0]
+            bump_version('data')
+            db.session.commit()
+            response_cache.invalidate(*INGEST_TAGS)
+            count_readings('accepted')
+
+            return jsonify(new_wall_data.to_json())
+        else:
+            count_readings('below_min')
+            return jsonify({'message': 'Data not saved. Total sum is less than 0.2'})
+
+# -----------------------------------------------------------------------
+@bp.route(BASE_URL + '/newBatch', methods=['POST'])
+def create_batch():
+    # Recibe un arreglo de lecturas (o {"readings": [...]}) y las guarda
+    # todas en una sola transacción. Cada lectura puede traer su propia
+    # fecha ("date": "YYYY-MM-DD HH:MM:SS") tomada por el dispositivo.
+    data = request.get_json(silent=True)
+
+    if isinstance(data, dict):
+        data = data.get('readings')
+
+    if not isinstance(data, list):
+        return jsonify({'error': "Expected a JSON array of readings or {'readings': [...]}"}), 400
+
+    if len(data) > BATCH_MAX_SIZE:
+        return jsonify({'error': f'Batch too large. Maximum is {BATCH_MAX_SIZE} readings'}), 413
+
+    date = datetime.now(mexico_tz).replace(tzinfo=None, microsecond=0)
+
+    results = []
+    accepted = []
+
+    for index, item in enumerate(data):
+        try:
+            reading = parse_reading(item, date)
+        except ValueError as e:
+            results.append({'index': index, 'status': 'rejected', 'error': str(e)})
+            count_readings('invalid')
+            continue
+
+        if sum(reading[propeller] for propeller in PROPELLERS) < MIN_TOTAL_SUM:
+            results.append({'index': index, 'status': 'rejected', 'error': 'Total sum is less than 0.2'})
+            count_readings('below_min')
+            continue
+
+        results.append({'index': index, 'status': 'accepted'})
+        accepted.append((len(results) - 1, reading))
+
+    # Si no se aceptó nada no cambian los datos, ni la versión ni la caché
+    if accepted:
+        try:
+            new_rows = ingest_readings([reading for _, reading in accepted])
+            bump_version('data')
+            db.session.commit()
+            response_cache.invalidate(*INGEST_TAGS)
+        except Exception:
+            # El error de la base no se regresa al dispositivo, solo al log
+            db.session.rollback()
+            logger.exception('batch_ingest_failed size=%d', len(accepted))
+            return jsonify({'error': 'The batch could not be saved'}), 500
+
+        count_readings('accepted', len(accepted))
+        for (position, _), new_wall_data in zip(accepted, new_rows):
+            results[position]['id'] = new_wall_data.id
+
+    return jsonify({
+        'accepted': len(accepted),
+        'rejected': len(results) - len(accepted),
+        'results': results
+    })
+
+@bp.route(BASE_URL + "/update", methods=["POST"])
+def update_status():
+    try:
+        data = request.get_json()
+        if "status" not in data:
+            return jsonify({"error": "Missing 'status' field"}), 400
+        
+        new_status = int(data["status"])
+        if new_status not in [0, 1]:
+            return jsonify({"error": "Invalid status value. Must be 0 or 1"}), 400
+
+        # Un heartbeat solo actualiza CurrentStatus, los cambios van a la historia
+        current, changed = record_status(new_status)
+        db.session.commit()
+
+        return jsonify({
+            "message": "New status recorded" if changed else "Heartbeat recorded",
+            "status": new_status,
+            "lastUpdate": current.last_update.strftime('%Y-%m-%d %H:%M:%S')
+        }), 200
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+# ---GET----------------------------------------------------------------
+
+# GETs | WallData
+
+@bp.route(BASE_URL + "/statusHistory", methods=["GET"])
+@conditional('status')
+def get_status_history():
+    # Cada renglón es un intervalo con el mismo estado (start / end).
+    # Sin paginar se mantiene el orden por last_update, las páginas van por id
+    return list_response(
+        SystemStatus.query,
+        SystemStatus.id,
+        descending=True,
+        stream_order=[SystemStatus.last_update.desc()]
+    )
+
+
+
+@bp.route(BASE_URL + "/status", methods=["GET"])
+def get_status():
+    system_status = db.session.get(CurrentStatus, 1)
+    
+    if not system_status:
+        return jsonify({"status": 0, "message": "No status found"}), 404
+
+    return jsonify(system_status.to_json()), 200
+
+
+
+@bp.route(BASE_URL + "/resetStatusHistory", methods=["DELETE"])
+def reset_status_history():
+    try:
+        db.session.query(SystemStatus).delete()
+        db.session.query(CurrentStatus).delete()
+        bump_version('status')
+        db.session.commit()
+        return jsonify({"message": "Status history deleted"}), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+
+
+
+@bp.route(BASE_URL + '/readTempLatest/<number>', methods=['GET'])
+def readTempLatest(number):
+    latest_data = TempWallData.query.filter_by(group=number).order_by(TempWallData.id.desc()).first()
+    return jsonify(latest_data.to_json())
+
+# -----------------------------------------------------------------------
+
+@bp.route(BASE_URL + '/readLatest', methods=['GET'])
+def readLatest():
+    latest_data = WallData.query.order_by(WallData.id.desc()).first()
+    return jsonify(latest_data.to_json())
+# -----------------------------------------------------------------------
+@bp.route(BASE_URL + '/readAll', methods=['GET'])
+def readAll():
+    # Las lecturas ya compactadas por la retención van primero
+    return list_response(WallData.query, WallData.id, prefix_query=downsampled_query())
+# -----------------------------------------------------------------------
+@bp.route(BASE_URL + '/getAllHours', methods=['GET'])
+def get_all_hours():
+    date_str = request.args.get('date')
+    if not date_str:
+        date = datetime.now(mexico_tz).date()
+    else:
+        try:
+            date = datetime.strptime(date_str, '%Y-%m-%d').date()
+        except ValueError:
+            return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
+
+    day_start = datetime.combine(date, datetime.min.time())
+    all_data = TotalHour.query.filter(TotalHour.date >= day_start, TotalHour.date < day_start + timedelta(days=1)).all()
+
+    hourly_totals = {hour: 0 for hour in range(24)}
+
+    for data in all_data:
+        hourly_totals[data.date.hour] += data.total
+
+    return jsonify(hourly_totals)
+
+# -----------------------------------------------------------------------
+@bp.route(BASE_URL + '/getAllMinutes', methods=['GET'])
+def get_all_minutes():
+    date_str = request.args.get('date')
+    if not date_str:
+        return jsonify({'error': 'Date parameter is required'}), 400
+
+    try:
+        date = datetime.strptime(date_str, '%Y-%m-%d %H:%M:%S')
+    except ValueError:
+        return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD HH:MM:SS'}), 400
+
+
+    hour_start = date.replace(minute=0, second=0, microsecond=0)
+    all_data = TotalMinute.query.filter(
+        TotalMinute.date >= hour_start,
+        TotalMinute.date < hour_start + timedelta(hours=1)
+    ).all()
+
+    logger.debug('get_all_minutes hour=%s rows=%d', hour_start, len(all_data))
+    minute_totals = {minute: {
+        'propeller1': 0,
+        'propeller2': 0,
+        'propeller3': 0,
+        'propeller4': 0,
+        'propeller5': 0,
+        'total': 0
+    } for minute in range(60)}
+
+    for data in all_data:
+        minute = data.date.minute
+        for propeller in PROPELLERS:
+            minute_totals[minute][propeller] += getattr(data, propeller)
+        minute_totals[minute]['total'] += data.total
+
+    return jsonify(minute_totals)
+# -----------------------------------------------------------------------
+@bp.route(BASE_URL + '/getHourByNumber/<number>', methods=['GET'])
+def get_hour_by_number(number):
+
+    today = datetime.now(mexico_tz).date()
+
+    try:
+        hour_start = datetime.combine(today, datetime.min.time()).replace(hour=int(number))
+    except ValueError:
+        # Una hora fuera de 0-23 nunca tiene datos
+        return jsonify({'hour': number, 'total': 0})
+
+    total = db.session.query(
+        func.sum(WallData.propeller1 + WallData.propeller2 + WallData.propeller3 + WallData.propeller4 + WallData.propeller5)
+    ).filter(WallData.date >= hour_start, WallData.date < hour_start + timedelta(hours=1)).scalar() or 0
+
+    return jsonify({'hour': number, 'total': total})
+
+# -----------------------------------------------------------------------
+@bp.route(BASE_URL + '/get_totals', methods=['GET'])
+@cached('wall_data')
+def get_totals():
+    # TotalGroup ya tiene la suma por grupo, incluyendo lo compactado
+    totals = {f'group{row.group}': row.total for row in TotalGroup.query.order_by(TotalGroup.group)}
+    return jsonify(totals)
+#- Fin de GET para WallData-----------------------------------------------
+
+# -----------------------------------------------------------------------
+@bp.route(BASE_URL + '/analytics', methods=['GET'])
+@cached('wall_data')
+def get_analytics():
+    # /analytics?from=YYYY-MM-DD&to=YYYY-MM-DD&bucket=minute|hour|day|month
+    # Energía (suma de potencia), promedio, máximo, percentiles y factor de
+    # capacidad por propeller y por grupo. Solo lecturas sin compactar.
+    analytics = optional_import('muro_eolico.analytics')
+    if analytics is None:
+        return jsonify({'error': 'Analytics are not available on this server'}), 501
+
+    try:
+        start = parse_export_date(request.args.get('from'), False)
+        end = parse_export_date(request.args.get('to'), True)
+    except ValueError:
+        return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD or YYYY-MM-DD HH:MM:SS'}), 400
+    if start is None or end is None:
+        return jsonify({'error': "Missing 'from' or 'to'"}), 400
+
+    bucket = request.args.get('bucket', 'hour')
+    if bucket not in analytics.BUCKETS:
+        return jsonify({'error': f"Invalid bucket. Use {', '.join(analytics.BUCKETS)}"}), 400
+
+    count = db.session.query(func.count(WallData.id)).filter(WallData.date >= start, WallData.date < end).scalar()
+    if count > ANALYTICS_MAX_ROWS:
+        return jsonify({'error': f'Range too large, {count} readings (max {ANALYTICS_MAX_ROWS})'}), 400
+
+    dates, groups, readings = analytics_arrays(start, end)
+    buckets = analytics.summarize(dates, groups, readings, bucket, propeller_power, RATED_POWER or None, list(PROPELLERS))
+    for row in buckets:
+        row['date'] = row['date'].strftime('%Y-%m-%d %H:%M:%S')
+
+    return jsonify({
+        'from': start.strftime('%Y-%m-%d %H:%M:%S'),
+        'to': end.strftime('%Y-%m-%d %H:%M:%S'),
+        'bucket': bucket,
+        'count': len(dates),
+        'buckets': buckets
+    })
+
+@bp.route(BASE_URL + '/export', methods=['GET'])
+def export_wall_data():
+    # /export?from=YYYY-MM-DD&to=YYYY-MM-DD&format=csv|binary|arrow|npy|frames
+    # 'binary' elige Arrow si está pyarrow, .npy si está numpy y si no frames.
+    try:
+        start = parse_export_date(request.args.get('from'), False)
+        end = parse_export_date(request.args.get('to'), True)
+    except ValueError:
+        return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD or YYYY-MM-DD HH:MM:SS'}), 400
+
+    pyarrow = optional_import('pyarrow.ipc')
+    numpy = optional_import('numpy')
+    export_format = request.args.get('format', 'csv')
+    if export_format == 'binary':
+        export_format = 'arrow' if pyarrow is not None else 'npy' if numpy is not None else 'frames'
+
+    if export_format == 'arrow' and pyarrow is None or export_format == 'npy' and numpy is None:
+        return jsonify({'error': f"Format '{export_format}' is not available on this server"}), 501
+
+    name = 'wall_data'
+    if start is not None:
+        name += '_' + start.strftime('%Y%m%d')
+    if end is not None:
+        # end es exclusivo; el nombre lleva el último día incluido
+        name += '_' + (end - timedelta(microseconds=1)).strftime('%Y%m%d')
+
+    if export_format == 'csv':
+        body, mimetype, extension = export_csv(export_batches(start, end)), 'text/csv', 'csv'
+    elif export_format == 'frames':
+        body, mimetype, extension = export_frames(export_batches(start, end)), 'application/octet-stream', 'wdf'
+    elif export_format == 'arrow':
+        body, mimetype, extension = export_arrow(export_batches(start, end)), 'application/vnd.apache.arrow.stream', 'arrows'
+    elif export_format == 'npy':
+        count_query = db.session.query(func.count(WallData.id), func.max(WallData.id))
+        if start is not None:
+            count_query = count_query.filter(WallData.date >= start)
+        if end is not None:
+            count_query = count_query.filter(WallData.date < end)
+        count, max_id = count_query.one()
+        count += downsampled_query(start, end).order_by(None).count()
+
+        # No incluir lo que llegue después de contar
+        batches = export_batches(start, end) if max_id is None else (
+            [row for row in batch if row[0] is None or row[0] <= max_id] for batch in export_batches(start, end)
+        )
+        body, mimetype, extension = export_npy(batches, count), 'application/octet-stream', 'npy'
+    else:
+        return jsonify({'error': 'Invalid format. Use csv, binary, arrow, npy or frames'}), 400
+
+    response = streamed_response(body, mimetype=mimetype)
+    response.headers['Content-Disposition'] = f'attachment; filename={name}.{extension}'
+    return response
+
+# GETs | TotalDay -------------------------------------------------------
+
+@bp.route(BASE_URL + '/readAllDays', methods=['GET'])
+@conditional('data')
+def readAllDays():
+    return list_response(TotalDay.query, TotalDay.id)
+
+# -----------------------------------------------------------------------
+
+@bp.route(BASE_URL + '/getCurrentDay', methods=['GET'])
+@cached('total_day')
+def get_current_day():
+    today = datetime.now(mexico_tz).date()
+    today_object = TotalDay.query.filter_by(date=today).first()
+
+
+
+    if today_object is None:
+        return jsonify({'total': 0})
+    else:
+        return jsonify(today_object.to_json())
+
+# -----------------------------------------------------------------------
+@bp.route(BASE_URL + '/read30days', methods=['GET'])
+@cached('total_day')
+def read30days():
+
+    # Hacer un diccionario del 1 al 30 que tenga el total de cada día
+    today = datetime.now(mexico_tz).date()
+    thirty_days_ago = today - timedelta(days=30)
+    all_data = TotalDay.query.filter(TotalDay.date >= thirty_days_ago, TotalDay.date <= today).all()
+
+    # Crear un diccionario con los últimos 30 días, inicializando en 0
+    day_totals = { (thirty_days_ago + timedelta(days=i)).strftime('%d'): 0 for i in range(31) }
+
+    # Actualizar el diccionario con los valores reales
+    for day in all_data:
+        day_totals[day.date.strftime('%d')] = day.total
+
+    return jsonify(day_totals)
+# -----------------------------------------------------------------------
+
+@bp.route(BASE_URL + '/getWeek', methods=['GET'])
+@cached('total_day')
+def get_week():
+    today = datetime.now(mexico_tz).date()
+    week_start = today - timedelta(days=today.weekday())
+    week_end = week_start + timedelta(days=6)
+
+    week_data = TotalDay.query.filter(TotalDay.date >= week_start, TotalDay.date <= week_end).all()
+
+    week_totals = {day.date.strftime('%A, %Y-%m-%d'): (day.total ** 2/216 * 1000) for day in week_data}
+    total_week = sum(day.total for day in week_data)
+
+    return jsonify({'week_totals': week_totals, 'total_week': total_week})
+
+# -----------------------------------------------------------------------
+
+@bp.route(BASE_URL + '/getDayByNumber/<number>', methods=['GET'])
+def get_day_by_number(number):
+
+    today = datetime.now(mexico_tz).date()
+    all_data = TotalDay.query.all()
+
+    total = 0
+
+    for data in all_data:
+        if data.date.day == int(number):
+            total += data.total
+
+    return jsonify({'day': number, 'total': total})
+
+#- Fin de GET para TotalDay -----------------------------------------------
+
+# GETs | TotalMonth -----------------------------------------------------
+
+@bp.route(BASE_URL + '/getCurrentMonth', methods=['GET'])
+@cached('total_month')
+def get_current_month():
+    today = datetime.now(mexico_tz).date()
+    month_start = today.replace(day=1)
+    month_object = TotalMonth.query.filter_by(date=month_start).first()
+
+    if month_object is None:
+        return jsonify({'total': 0})
+    else:
+        return jsonify(month_object.to_json())
+    
+# -----------------------------------------------------------------------
+@bp.route(BASE_URL + '/readAllMonths', methods=['GET'])
+@conditional('data')
+@cached('total_month')
+def readAllMonths():
+    all_data = TotalMonth.query.all()
+
+    #Crear un diccionario de meses del 1 al 12 que tenga el total de cada mes
+    month_totals = {month: 0 for month in range(1, 13)}
+
+    for data in all_data:
+        month = data.date.month
+        month_totals[month] += data.total
+
+    return jsonify(month_totals)
+
+# -----------------------------------------------------------------------
+@bp.route(BASE_URL + '/getMonthsObjects', methods=['GET'])
+@conditional('data')
+def get_months_objects():
+    return list_response(TotalMonth.query, TotalMonth.id)
+
+#- Fin de GET para TotalMonth --------------------------------------------
+
+# GETs | TotalAll -------------------------------------------------------
+@bp.route(BASE_URL + '/getTotal', methods=['GET'])
+@cached('total_all')
+def get_total():
+    total_object = TotalAll.query.first()
+
+    if total_object is None:
+        return jsonify({'total': 0})
+    else:
+        return jsonify(total_object.to_json())
+
+# -----------------------------------------------------------------------
+
+
+
+# ---DELETE-------------------------------------------------------------
+@bp.route(BASE_URL + '/resetAll', methods=['DELETE'])
+def resetAll():
+    db.session.query(WallData).delete()
+    db.session.query(WallDataRollup).delete()
+    db.session.query(TotalDay).delete()
+    db.session.query(TotalMonth).delete()
+    db.session.query(TotalAll).delete()
+    db.session.query(TotalHour).delete()
+    db.session.query(TotalMinute).delete()
+    db.session.query(TotalGroup).delete()
+    bump_version('data')
+    db.session.commit()
+    response_cache.invalidate(*INGEST_TAGS)
+    return jsonify({'message': 'All data has been deleted'})
+# -----------------------------------------------------------------------
+@bp.route(BASE_URL + '/resetTempWallData', methods=['DELETE'])
+def resetTempWallData():
+    db.session.query(TempWallData).delete()
+    bump_version('data')
+    db.session.commit()
+    return jsonify({'message': 'All data has been deleted'})
+# -----------------------------------------------------------------------
+@bp.route(BASE_URL + '/deleteAllZeros', methods=['DELETE'])
+def deleteAllZeros():
+    # Los renglones en cero no suman nada a los totales, no hay que restar
+    db.session.query(WallData).filter(WallData.propeller1 == 0, WallData.propeller2 == 0, WallData.propeller3 == 0, WallData.propeller4 == 0, WallData.propeller5 == 0).delete()
+    bump_version('data')
+    db.session.commit()
+    response_cache.invalidate('wall_data')
+    return jsonify({'message': 'All zeros have been deleted'})
+# -----------------------------------------------------------------------
+
+@bp.route(BASE_URL + '/deleteLastStatus', methods=['DELETE'])
+def delete_last_status():
+    try:
+        last_entry = SystemStatus.query.order_by(SystemStatus.id.desc()).first()
+        if last_entry:
+            db.session.delete(last_entry)
+
+            # El intervalo anterior vuelve a quedar abierto
+            previous = SystemStatus.query.filter(SystemStatus.id < last_entry.id).order_by(SystemStatus.id.desc()).first()
+            if previous:
+                previous.ended_at = None
+            sync_current_status()
+
+            bump_version('status')
+            db.session.commit()
+            return jsonify({"message": "Last status entry deleted", "deleted_entry": last_entry.to_json()}), 200
+        else:
+            return jsonify({"message": "No status entries found"}), 404
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+# -----------------------------------------------------------------------
+
+@bp.route(BASE_URL + '/deleteLastWallData', methods=['DELETE'])
+def delete_last_wall_data():
+    try:
+        last_entry = WallData.query.order_by(WallData.id.desc()).first()
+        if last_entry:
+            subtract_aggregates(WallData.id == last_entry.id)
+            db.session.delete(last_entry)
+            bump_version('data')
+            db.session.commit()
+            response_cache.invalidate(*INGEST_TAGS)
+            return jsonify({"message": "Last WallData entry deleted", "deleted_entry": last_entry.to_json()}), 200
+        else:
+            return jsonify({"message": "No WallData entries found"}), 404
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+    
+
+@bp.route(BASE_URL + '/deleteRangeWallData', methods=['DELETE'])
+def delete_range_wall_data():
+    try:
+        data = request.get_json()
+        start_id = data.get("start_id")
+        end_id = data.get("end_id")
+
+        if start_id is None or end_id is None:
+            return jsonify({"error": "Missing 'start_id' or 'end_id' in request"}), 400
+
+        # Eliminar el rango especificado
+        subtract_aggregates(WallData.id >= start_id, WallData.id <= end_id)
+        deleted = WallData.query.filter(WallData.id >= start_id, WallData.id <= end_id).delete(synchronize_session=False)
+        bump_version('data')
+        db.session.commit()
+        response_cache.invalidate(*INGEST_TAGS)
+
+        return jsonify({
+            "message": f"{deleted} entries deleted from WallData",
+            "range": f"{start_id} to {end_id}"
+        }), 200
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@bp.route(BASE_URL + '/rebuildAggregates', methods=['POST'])
+def rebuild_aggregates():
+    # Recalcula los totales de [from, to] desde WallData, un día por
+    # transacción para no cargar todo el rango en memoria. TotalGroup se
+    # recalcula completo una sola vez, junto con el último día.
+    try:
+        start = datetime.strptime(request.args['from'], '%Y-%m-%d')
+        end = datetime.strptime(request.args['to'], '%Y-%m-%d')
+    except KeyError:
+        return jsonify({"error": "Missing 'from' or 'to' in request"}), 400
+    except ValueError:
+        return jsonify({"error": "Invalid date format. Use YYYY-MM-DD"}), 400
+
+    if end < start:
+        return jsonify({"error": "'to' must not be before 'from'"}), 400
+    if (end - start).days + 1 > REBUILD_MAX_DAYS:
+        return jsonify({"error": f"Range too large, max {REBUILD_MAX_DAYS} days"}), 400
+
+    # Los días ya compactados no tienen lecturas crudas para recalcular
+    skipped = 0
+    if RAW_RETENTION_DAYS > 0 and start < raw_cutoff():
+        skipped = min((raw_cutoff() - start).days, (end - start).days + 1)
+        start = max(start, raw_cutoff())
+
+    try:
+        days = 0
+        readings = 0
+        day = start
+        while day <= end:
+            readings += rebuild_day_aggregates(day)
+            if day + timedelta(days=1) > end:
+                rebuild_group_totals()
+            bump_version('data')
+            db.session.commit()
+            days += 1
+            day += timedelta(days=1)
+    except Exception:
+        db.session.rollback()
+        logger.exception('rebuild_aggregates_failed day=%s', day.date())
+        return jsonify({"error": f"Could not rebuild aggregates for {day.strftime('%Y-%m-%d')}"}), 500
+    finally:
+        response_cache.invalidate(*INGEST_TAGS)
+
+    return jsonify({
+        "message": f"Aggregates rebuilt for {days} days",
+        "days": days,
+        "readings": readings,
+        "skippedDownsampledDays": skipped
+    }), 200
+
+
+@bp.route(BASE_URL + '/updateStatusRange', methods=['PUT'])
+def update_status_range():
+    try:
+        data = request.get_json()
+        start_id = data.get("start_id")
+        end_id = data.get("end_id")
+
+        if start_id is None or end_id is None:
+            return jsonify({"error": "Missing 'start_id' or 'end_id'"}), 400
+
+        # Filtrar solo los registros con status = 0 dentro del rango
+        entries = SystemStatus.query.filter(
+            SystemStatus.id >= start_id,
+            SystemStatus.id <= end_id,
+            SystemStatus.status == 0
+        ).all()
+
+        updated_ids = []
+
+        for entry in entries:
+            entry.status = 1
+            updated_ids.append(entry.id)
+            # No se actualiza last_update
+
+        sync_current_status()
+        bump_version('status')
+        db.session.commit()
+
+        return jsonify({
+            "message": f"{len(updated_ids)} entries updated from 0 to 1 (timestamp preserved)",
+            "updated_ids": updated_ids
+        }), 200
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+# ---ADMINISTRACIÓN-----------------------------------------------------
+
+@bp.route(BASE_URL + '/cacheStats', methods=['GET'])
+def cache_stats():
+    return jsonify(response_cache.stats())
+
+@bp.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    if not METRICS_ENABLED:
+        abort(404)
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+@bp.route(BASE_URL + '/profiles', methods=['GET'])
+def list_profiles():
+    # Perfiles guardados, el más reciente primero
+    if PROFILE_MODE == 'off' or not profile_token_ok():
+        abort(404)
+
+    files = sorted((file for file in os.listdir(PROFILE_DIR) if PROFILE_FILE.fullmatch(file)), reverse=True) if os.path.isdir(PROFILE_DIR) else []
+    return jsonify([
+        {'name': file, 'size': os.path.getsize(os.path.join(PROFILE_DIR, file))}
+        for file in files
+    ])
+
+@bp.route(BASE_URL + '/profiles/<name>', methods=['GET'])
+def get_profile(name):
+    if PROFILE_MODE == 'off' or not profile_token_ok() or not PROFILE_FILE.fullmatch(name):
+        abort(404)
+
+    path = os.path.join(PROFILE_DIR, name)
+    if not os.path.isfile(path):
+        abort(404)
+    with open(path, encoding='utf-8') as file:
+        return Response(file.read(), mimetype='text/plain')
+
+@bp.route(BASE_URL + '/ingestStats', methods=['GET'])
+def ingest_stats():
+    return jsonify(ingest_queue.stats())
+
+# -----------------------------------------------------------------------
+# FIN DE | METODOS HTTP
+# -----------------------------------------------------------------------
@@ -0,0 +1,97 @@
+# -----------------------------------------------------------------------
+# TAREAS PROGRAMADAS
+# -----------------------------------------------------------------------
+#   Las tareas se registran con @scheduled_job en jobs.py. APScheduler solo
+#   se importa cuando de verdad se van a correr.
+
+import os
+import socket
+import threading
+from datetime import datetime, timedelta
+
+import pytz
+
+from .config import logger
+from .database import db, dialect_insert
+from .models import SchedulerLease
+
+SCHEDULED_JOBS = {}  # nombre -> (función, intervalo en segundos)
+
+scheduler = None
+scheduler_lock = threading.Lock()
+
+# Tarea que corre en este hilo, para renovar su lease desde adentro
+current_job = threading.local()
+
+def scheduled_job(name, interval):
+    # Registra una función para que el scheduler la corra cada `interval`
+    def decorator(function):
+        SCHEDULED_JOBS[name] = (function, interval)
+        return function
+    return decorator
+
+def acquire_lease(name, seconds):
+    # Toma o renueva el lease de una tarea. Regresa True si este proceso
+    # es el dueño y debe ejecutarla. El UPDATE condicionado es atómico, así
+    # que dos workers nunca quedan como dueños al mismo tiempo.
+    owner = f'{socket.gethostname()}:{os.getpid()}'
+    now = datetime.now(pytz.utc).replace(tzinfo=None)
+    expires_at = now + timedelta(seconds=seconds)
+
+    acquired = SchedulerLease.query.filter(
+        SchedulerLease.name == name,
+        db.or_(SchedulerLease.expires_at < now, SchedulerLease.owner == owner)
+    ).update({'owner': owner, 'expires_at': expires_at}, synchronize_session=False)
+
+    if not acquired:
+        stmt = dialect_insert(SchedulerLease).values(name=name, owner=owner, expires_at=expires_at)
+        acquired = db.session.execute(stmt.on_conflict_do_nothing(index_elements=['name'])).rowcount
+
+    db.session.commit()
+    return acquired == 1
+
+def renew_lease():
+    # Las tareas que trabajan por lotes la llaman después de cada commit
+    # para que el lease no venza a la mitad. Regresa False si otro proceso
+    # ya lo tomó y la tarea debe parar. Fuera del scheduler (comandos de
+    # flask) no hay lease y siempre regresa True.
+    name = getattr(current_job, 'name', None)
+    if name is None:
+        return True
+    if acquire_lease(name, SCHEDULED_JOBS[name][1] * 2):
+        return True
+    logger.warning('job_lease_lost job=%s', name)
+    return False
+
+def run_job(app, name):
+    function, interval = SCHEDULED_JOBS[name]
+    with app.app_context():
+        try:
+            # El lease dura dos intervalos: si el dueño muere otro toma la tarea
+            if acquire_lease(name, interval * 2):
+                current_job.name = name
+                function()
+        except Exception:
+            db.session.rollback()
+            logger.exception('job_failed job=%s', name)
+        finally:
+            current_job.name = None
+            db.session.remove()
+
+def start_scheduler(app, blocking=False):
+    # APScheduler y las tareas solo se importan cuando de verdad se van a correr
+    global scheduler
+    from apscheduler.schedulers.background import BackgroundScheduler
+    from apscheduler.schedulers.blocking import BlockingScheduler
+    from . import jobs  # registra las tareas en SCHEDULED_JOBS
+
+    with scheduler_lock:
+        if scheduler is not None:
+            return scheduler
+
+        scheduler = BlockingScheduler() if blocking else BackgroundScheduler(daemon=True)
+        for name, (function, interval) in SCHEDULED_JOBS.items():
+            scheduler.add_job(run_job, 'interval', args=[app, name], seconds=interval, id=name, coalesce=True, max_instances=1)
+
+    scheduler.start()
+    return scheduler
@@ -0,0 +1,184 @@
+# -----------------------------------------------------------------------
+# SERIALIZACIÓN | tuplas de columnas -> mismo JSON que to_json()
+# -----------------------------------------------------------------------
+#   Los endpoints de listas leen solo las columnas (sin objetos del ORM ni
+#   identity map) y arman el dict de cada renglón directamente.
+
+import itertools
+import re
+
+from flask import request, current_app, jsonify, Response
+
+# Opcional, acelera el JSON de los endpoints de listas
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from .config import PROPELLERS, PAGE_MAX_LIMIT, STREAM_BATCH_SIZE
+from .database import db
+from .dates import format_datetime, format_local
+from .metrics import count_rows, streamed_response
+from .models import WallData, WallDataRollup, TotalDay, TotalMonth, SystemStatus
+
+def rollup_row_json(row):
+    # Igual que WallDataRollup.to_json. row[0] es el id del renglón
+    # compactado, solo sirve para paginar y no va en el JSON.
+    data = {'id': None, 'date': format_datetime(row[1]), 'group': row[2], 'count': row[3], 'resolution': row[4]}
+    for i, propeller in enumerate(PROPELLERS):
+        data[propeller] = row[5 + i] / row[3]
+    return data
+
+def status_row_json(row):
+    # Igual que SystemStatus.to_json
+    last_update = format_local(row[2])
+    return {
+        'id': row[0],
+        'status': row[1],
+        'lastUpdate': last_update,
+        'start': last_update,
+        'end': format_local(row[3]) if row[3] else None
+    }
+
+# modelo -> (columnas, función que convierte la tupla). El id va primero.
+ROW_SERIALIZERS = {
+    WallData: (
+        (WallData.id, WallData.date, WallData.group) + tuple(getattr(WallData, propeller) for propeller in PROPELLERS),
+        lambda row: {
+            'id': row[0], 'date': format_datetime(row[1]), 'group': row[2],
+            'propeller1': row[3], 'propeller2': row[4], 'propeller3': row[5], 'propeller4': row[6], 'propeller5': row[7]
+        }
+    ),
+    WallDataRollup: (
+        (WallDataRollup.id, WallDataRollup.date, WallDataRollup.group, WallDataRollup.count, WallDataRollup.resolution)
+        + tuple(getattr(WallDataRollup, propeller + '_sum') for propeller in PROPELLERS),
+        rollup_row_json
+    ),
+    TotalDay: (
+        (TotalDay.id, TotalDay.date, TotalDay.total, TotalDay.group1, TotalDay.group2, TotalDay.group3),
+        lambda row: {
+            'id': row[0], 'date': row[1].isoformat(), 'total': row[2],
+            'group1': row[3], 'group2': row[4], 'group3': row[5]
+        }
+    ),
+    TotalMonth: (
+        (TotalMonth.id, TotalMonth.date, TotalMonth.total),
+        lambda row: {'id': row[0], 'date': row[1].isoformat()[:7], 'total': row[2]}
+    ),
+    SystemStatus: (
+        (SystemStatus.id, SystemStatus.status, SystemStatus.last_update, SystemStatus.ended_at),
+        status_row_json
+    )
+}
+
+def serialized_rows(query, model):
+    # Cambia el query a solo columnas y regresa (query, función de la tupla)
+    columns, to_json = ROW_SERIALIZERS[model]
+    return query.with_entities(*columns), to_json
+
+# orjson escribe algunos floats distinto que json (1e16 vs 1e+16,
+# 0.00001 vs 1e-05). Si aparece uno, ese lote se codifica con json.
+# Ninguna llave tiene una 'e' seguida de dígito o '-'.
+ORJSON_EXPONENT = re.compile(rb'e[0-9-]')
+
+def dumps_rows(dicts):
+    # Lista de dicts -> los objetos JSON separados por coma, sin corchetes.
+    # Mismos bytes que unir app.json.dumps(d, separators=(',', ':')) de cada uno.
+    if orjson is not None:
+        encoded = orjson.dumps(dicts, option=orjson.OPT_SORT_KEYS)
+        if b'0.0000' not in encoded and not ORJSON_EXPONENT.search(encoded):
+            return encoded[1:-1].decode()
+    return current_app.json.dumps(dicts, separators=(',', ':'))[1:-1]
+
+def dumps_row(data):
+    return dumps_rows([data])
+
+def encode_rows(dicts, ndjson):
+    # Genera el JSON de una lista por partes, sin tenerla completa en memoria.
+    # Produce los mismos bytes que jsonify(list(dicts)).
+    if not ndjson:
+        yield '['
+
+    chunk = []
+    first = True
+    for data in dicts:
+        chunk.append(data)
+        if len(chunk) == STREAM_BATCH_SIZE:
+            yield encode_chunk(chunk, ndjson, first)
+            chunk = []
+            first = False
+
+    if chunk:
+        yield encode_chunk(chunk, ndjson, first)
+
+    if not ndjson:
+        yield ']\n'
+
+def encode_chunk(chunk, ndjson, first):
+    count_rows(len(chunk))
+    if ndjson:
+        return ''.join(dumps_row(data) + '\n' for data in chunk)
+    return ('' if first else ',') + dumps_rows(chunk)
+
+def list_response(query, id_column, descending=False, stream_order=None, prefix_query=None):
+    # Respuesta para los endpoints que regresan una tabla completa.
+    #   ?after_id=&limit=  -> una página ordenada por id (keyset), el header
+    #                         X-Next-After-Id trae el id para pedir la siguiente
+    #   ?format=ndjson     -> un objeto JSON por línea
+    #   sin parámetros     -> el arreglo completo, generado en streaming con
+    #                         yield_per para que la memoria no crezca con la tabla
+    # prefix_query (datos compactados) va antes que query. Al paginar, sus
+    # páginas se piden con ?after_rollup_id= y el header
+    # X-Next-After-Rollup-Id; la primera página que no llena el límite con
+    # ellos sigue con query desde el principio.
+    args = request.args
+    try:
+        after_id = int(args['after_id']) if 'after_id' in args else None
+        after_rollup_id = int(args['after_rollup_id']) if 'after_rollup_id' in args else None
+        limit = int(args['limit']) if 'limit' in args else None
+    except ValueError:
+        return jsonify({'error': "'after_id', 'after_rollup_id' and 'limit' must be integers"}), 400
+
+    ndjson = args.get('format') == 'ndjson'
+    mimetype = 'application/x-ndjson' if ndjson else 'application/json'
+    order = id_column.desc() if descending else id_column.asc()
+    query, to_json = serialized_rows(query, id_column.class_)
+    if prefix_query is not None:
+        prefix_model = prefix_query.column_descriptions[0]['entity']
+        prefix_query, prefix_to_json = serialized_rows(prefix_query, prefix_model)
+
+    if after_id is not None or after_rollup_id is not None or limit is not None:
+        limit = max(1, min(limit or PAGE_MAX_LIMIT, PAGE_MAX_LIMIT))
+        dicts = []
+        headers = {}
+
+        if prefix_query is not None and after_id is None:
+            if after_rollup_id is not None:
+                prefix_query = prefix_query.filter(prefix_model.id > after_rollup_id)
+            prefix_rows = prefix_query.order_by(None).order_by(prefix_model.id).limit(limit).all()
+            dicts = [prefix_to_json(row) for row in prefix_rows]
+            if len(prefix_rows) == limit:
+                headers['X-Next-After-Rollup-Id'] = str(prefix_rows[-1][0])
+
+        if len(dicts) < limit:
+            if after_id is not None:
+                query = query.filter(id_column < after_id if descending else id_column > after_id)
+            rows = query.order_by(order).limit(limit - len(dicts)).all()
+            dicts += [to_json(row) for row in rows]
+            if len(dicts) == limit:
+                headers['X-Next-After-Id'] = str(rows[-1][0])
+
+        return Response(''.join(encode_rows(dicts, ndjson)), mimetype=mimetype, headers=headers)
+
+    query = query.order_by(*(stream_order if stream_order is not None else [order]))
+    rows = map(to_json, streamed_rows(query))
+    if prefix_query is not None:
+        rows = itertools.chain(map(prefix_to_json, streamed_rows(prefix_query)), rows)
+    return streamed_response(encode_rows(rows, ndjson), mimetype=mimetype)
+
+def streamed_rows(query):
+    # El query se armó con la sesión de la vista, que ya se cerró cuando se
+    # envía el cuerpo. Se ejecuta con la sesión del contexto del streaming,
+    # la que se cierra al terminar; con la de la vista la conexión quedaba
+    # fuera del pool con la transacción abierta.
+    yield from query.with_session(db.session()).yield_per(STREAM_BATCH_SIZE)
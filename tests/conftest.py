@@ -0,0 +1,51 @@
+#   Pruebas de la API
+#   Cada prueba corre contra una SQLite temporal nueva y, si está definida
+#   TEST_POSTGRES_URI, también contra esa base de PostgreSQL (se borran y
+#   crean todas las tablas, usar una base solo para pruebas).
+#
+#   python -m pytest -q
+#   TEST_POSTGRES_URI=postgresql+psycopg2://postgres@127.0.0.1/muro_test python -m pytest -q
+
+import os
+import sys
+
+# La configuración se lee al importar muro_eolico
+os.environ.setdefault('SCHEDULER_MODE', 'off')
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import pytest
+
+from muro_eolico import create_app, db
+from muro_eolico.cache import response_cache, INGEST_TAGS
+
+POSTGRES_URI = os.getenv('TEST_POSTGRES_URI')
+
+
+@pytest.fixture(params=['sqlite', 'postgresql'])
+def app(request, tmp_path):
+    if request.param == 'sqlite':
+        uri = 'sqlite:///' + str(tmp_path / 'test.db')
+    elif POSTGRES_URI:
+        uri = POSTGRES_URI
+    else:
+        pytest.skip('TEST_POSTGRES_URI is not set')
+
+    app = create_app(uri)
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+    # La caché es por proceso, no debe pasar de una prueba a otra
+    response_cache.invalidate(*INGEST_TAGS)
+
+    yield app
+
+    with app.app_context():
+        db.session.remove()
+        db.drop_all()
+        db.engine.dispose()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
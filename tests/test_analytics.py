@@ -0,0 +1,56 @@
+#   /analytics: estadísticas de potencia por bucket, por propeller y por
+#   grupo. Necesita numpy; sin él responde 501.
+
+import pytest
+
+from muro_eolico import routes
+from muro_eolico.aggregates import propeller_power
+from muro_eolico.config import BASE_URL, PROPELLERS
+
+numpy = pytest.importorskip('numpy')
+
+
+def post_batch(client, readings):
+    batch = [{'group': group, 'date': date, **{propeller: value for propeller in PROPELLERS}} for date, group, value in readings]
+    assert client.post(BASE_URL + '/newBatch', json=batch).get_json()['accepted'] == len(batch)
+
+
+def test_hourly_statistics(client):
+    post_batch(client, [
+        ('2026-03-01 10:00:00', 1, 1.0),
+        ('2026-03-01 10:30:00', 2, 2.0),
+        ('2026-03-01 10:45:00', 1, 4.0),
+        ('2026-03-01 11:15:00', 1, 3.0),
+        ('2026-03-02 09:00:00', 1, 5.0),
+    ])
+
+    response = client.get(BASE_URL + '/analytics?from=2026-03-01&to=2026-03-01&bucket=hour')
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['count'] == 4
+    assert [bucket['date'] for bucket in body['buckets']] == ['2026-03-01 10:00:00', '2026-03-01 11:00:00']
+
+    ten = body['buckets'][0]
+    powers = [propeller_power(value) for value in (1.0, 2.0, 4.0)]
+    propeller1 = ten['propellers']['propeller1']
+    assert ten['count'] == 3
+    assert propeller1['energy'] == pytest.approx(sum(powers))
+    assert propeller1['max'] == pytest.approx(max(powers))
+    assert propeller1['p50'] == pytest.approx(numpy.percentile(powers, 50))
+    assert propeller1['p95'] == pytest.approx(numpy.percentile(powers, 95))
+
+    assert ten['groups']['group1']['count'] == 2
+    assert ten['groups']['group1']['energy'] == pytest.approx(5 * (powers[0] + powers[2]))
+    assert ten['groups']['group2']['energy'] == pytest.approx(5 * powers[1])
+
+
+def test_bad_parameters(client):
+    assert client.get(BASE_URL + '/analytics?from=2026-03-01').status_code == 400
+    assert client.get(BASE_URL + '/analytics?from=2026-03-01&to=2026-03-02&bucket=week').status_code == 400
+
+
+def test_without_numpy(client, monkeypatch):
+    monkeypatch.setattr(routes, 'optional_import', lambda name: None)
+    response = client.get(BASE_URL + '/analytics?from=2026-03-01&to=2026-03-02')
+    assert response.status_code == 501
+    assert client.get(BASE_URL + '/export?format=npy').status_code == 501
@@ -0,0 +1,33 @@
+#   /newBatch valida cada lectura por separado: las inválidas se rechazan
+#   con su error y las demás se guardan en la misma transacción.
+
+from muro_eolico.config import BASE_URL, PROPELLERS
+from muro_eolico.models import WallData
+
+
+def reading(group=1, value=1.0):
+    return {'group': group, **{propeller: value for propeller in PROPELLERS}}
+
+
+def test_batch_rejects_non_finite_and_out_of_range(app, client):
+    nan = reading()
+    nan['propeller3'] = float('nan')
+    batch = [reading(), nan, reading(value='inf'), reading(group=2 ** 70), reading(group=-1), reading(3)]
+
+    response = client.post(BASE_URL + '/newBatch', json=batch)
+    assert response.status_code == 200
+
+    body = response.get_json()
+    assert body['accepted'] == 2
+    assert [result['status'] for result in body['results']] == [
+        'accepted', 'rejected', 'rejected', 'rejected', 'rejected', 'accepted'
+    ]
+    assert body['results'][1]['error'] == 'Propeller values must be finite numbers'
+    assert body['results'][3]['error'].startswith('Group must be between')
+
+    with app.app_context():
+        assert sorted(row.group for row in WallData.query) == [1, 3]
+
+
+def test_new_rejects_non_finite(client):
+    assert client.post(BASE_URL + '/new', json=reading(value='nan')).status_code == 400
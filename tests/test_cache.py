@@ -0,0 +1,56 @@
+#   Caché de respuestas: TTL, desalojo LRU e invalidación por tags.
+
+from muro_eolico import cache
+from muro_eolico.cache import TTLCache
+from muro_eolico.config import BASE_URL, PROPELLERS
+from muro_eolico.database import db
+from muro_eolico.models import TotalAll
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self):
+        return self.now
+
+
+def test_ttl_lru_and_tags(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache, 'time', clock)
+    entries = TTLCache(ttl=5, max_entries=2)
+
+    entries.set('a', 1, ['total_day'])
+    entries.set('b', 2, ['total_month'])
+    assert entries.get('a') == 1
+
+    # 'b' es el menos usado
+    entries.set('c', 3, ['total_day', 'wall_data'])
+    assert entries.get('b') is None
+    assert entries.stats()['evictions'] == 1
+
+    entries.invalidate('wall_data')
+    assert entries.get('c') is None
+    assert entries.get('a') == 1
+
+    clock.now = 6
+    assert entries.get('a') is None
+    assert entries.stats()['size'] == 0
+
+
+def test_cached_endpoint_until_ingest(app, client):
+    reading = {'group': 1, **{propeller: 1.0 for propeller in PROPELLERS}}
+    client.post(BASE_URL + '/new', json=reading)
+    assert client.get(BASE_URL + '/getTotal').get_json()['total'] == 5.0
+
+    # Un cambio que no pasa por la API no invalida la caché
+    with app.app_context():
+        db.session.get(TotalAll, 1).total = 50.0
+        db.session.commit()
+    assert client.get(BASE_URL + '/getTotal').get_json()['total'] == 5.0
+
+    client.post(BASE_URL + '/new', json=reading)
+    assert client.get(BASE_URL + '/getTotal').get_json()['total'] == 55.0
+
+    stats = client.get(BASE_URL + '/cacheStats').get_json()
+    assert stats['hits'] >= 1 and stats['invalidations'] >= 1
@@ -0,0 +1,59 @@
+#   Varios hilos mandan lecturas a /new al mismo tiempo. Con los upserts
+#   atómicos ningún incremento se pierde: cada total tiene que ser igual a
+#   la suma de las lecturas que quedaron en WallData.
+
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from muro_eolico.aggregates import propeller_power
+from muro_eolico.config import BASE_URL, PROPELLERS
+from muro_eolico.models import WallData, TotalDay, TotalMonth, TotalAll, TotalGroup, TotalHour, TotalMinute
+
+THREADS = 8
+POSTS_PER_THREAD = 25
+
+
+def post_readings(app, seed):
+    # Un test client por hilo, cada petición con su propia sesión
+    client = app.test_client()
+    rng = random.Random(seed)
+    statuses = []
+    for _ in range(POSTS_PER_THREAD):
+        reading = {'group': rng.randint(1, 3)}
+        for propeller in PROPELLERS:
+            reading[propeller] = round(0.2 + rng.random() * 4.8, 3)
+        statuses.append(client.post(BASE_URL + '/new', json=reading).status_code)
+    return statuses
+
+
+def test_concurrent_new_keeps_totals(app):
+    with ThreadPoolExecutor(max_workers=THREADS) as pool:
+        statuses = [status for result in pool.map(lambda seed: post_readings(app, seed), range(THREADS)) for status in result]
+
+    assert statuses == [200] * (THREADS * POSTS_PER_THREAD)
+
+    with app.app_context():
+        rows = WallData.query.all()
+        assert len(rows) == THREADS * POSTS_PER_THREAD
+
+        days, months, groups, hours, minutes = {}, {}, {}, {}, {}
+        for row in rows:
+            total = sum(getattr(row, propeller) for propeller in PROPELLERS)
+            power = sum(propeller_power(getattr(row, propeller)) for propeller in PROPELLERS)
+            days[row.date.date()] = days.get(row.date.date(), 0) + total
+            month = row.date.date().replace(day=1)
+            months[month] = months.get(month, 0) + total
+            groups[row.group] = groups.get(row.group, 0) + total
+            hour = row.date.replace(minute=0, second=0)
+            hours[hour] = hours.get(hour, 0) + power
+            minute = row.date.replace(second=0)
+            minutes[minute] = minutes.get(minute, 0) + power
+
+        assert TotalAll.query.one().total == pytest.approx(sum(days.values()))
+        assert {row.date: row.total for row in TotalDay.query} == pytest.approx(days)
+        assert {row.date: row.total for row in TotalMonth.query} == pytest.approx(months)
+        assert {row.group: row.total for row in TotalGroup.query} == pytest.approx(groups)
+        assert {row.date: row.total for row in TotalHour.query} == pytest.approx(hours)
+        assert {row.date: row.total for row in TotalMinute.query} == pytest.approx(minutes)
@@ -0,0 +1,44 @@
+#   GETs condicionales: el ETag sale de DataVersion, un If-None-Match que
+#   coincide responde 304 y cualquier escritura cambia la versión.
+
+from muro_eolico.config import BASE_URL, PROPELLERS
+
+
+def post_reading(client, group=1):
+    reading = {'group': group, **{propeller: 1.0 for propeller in PROPELLERS}}
+    assert client.post(BASE_URL + '/new', json=reading).status_code == 200
+
+
+def test_etag_and_not_modified(client):
+    post_reading(client)
+
+    first = client.get(BASE_URL + '/readAllDays')
+    assert first.status_code == 200
+    assert first.headers['ETag'] == '"data-1"'
+    assert first.headers['Cache-Control'] == 'no-cache'
+    assert 'Last-Modified' in first.headers
+
+    again = client.get(BASE_URL + '/readAllDays', headers={'If-None-Match': first.headers['ETag']})
+    assert again.status_code == 304
+    assert again.get_data() == b''
+    assert again.headers['ETag'] == first.headers['ETag']
+
+    post_reading(client, 2)
+    changed = client.get(BASE_URL + '/readAllDays', headers={'If-None-Match': first.headers['ETag']})
+    assert changed.status_code == 200
+    assert changed.headers['ETag'] == '"data-2"'
+    assert changed.get_json()[0]['total'] == 10.0
+
+
+def test_status_writes_change_only_the_status_etag(client):
+    assert client.post(BASE_URL + '/update', json={'status': 1}).status_code == 200
+    status_etag = client.get(BASE_URL + '/statusHistory').headers['ETag']
+    data_etag = client.get(BASE_URL + '/getMonthsObjects').headers['ETag']
+
+    # Un heartbeat sin cambio de estado no crea intervalo ni cambia el ETag
+    client.post(BASE_URL + '/update', json={'status': 1})
+    assert client.get(BASE_URL + '/statusHistory', headers={'If-None-Match': status_etag}).status_code == 304
+
+    client.post(BASE_URL + '/update', json={'status': 0})
+    assert client.get(BASE_URL + '/statusHistory', headers={'If-None-Match': status_etag}).status_code == 200
+    assert client.get(BASE_URL + '/getMonthsObjects', headers={'If-None-Match': data_etag}).status_code == 304
@@ -0,0 +1,29 @@
+#   Borrar lecturas de WallData resta de los totales lo que sumaban.
+
+from muro_eolico.config import BASE_URL, PROPELLERS
+
+
+def post_reading(client, group, value):
+    reading = {'group': group, **{propeller: value for propeller in PROPELLERS}}
+    return client.post(BASE_URL + '/new', json=reading).get_json()['id']
+
+
+def test_deleted_group_leaves_totals(client):
+    post_reading(client, 1, 1.5)
+    first = post_reading(client, 2, 0.1)
+    last = post_reading(client, 2, 0.7)
+    post_reading(client, 3, 2.0)
+
+    response = client.delete(BASE_URL + '/deleteRangeWallData', json={'start_id': first, 'end_id': last})
+    assert response.status_code == 200
+
+    assert client.get(BASE_URL + '/get_totals').get_json() == {'group1': 7.5, 'group3': 10.0}
+
+
+def test_delete_invalidates_cached_totals(client):
+    post_reading(client, 1, 1.0)
+    post_reading(client, 2, 2.0)
+    assert client.get(BASE_URL + '/getTotal').get_json()['total'] == 15.0
+
+    assert client.delete(BASE_URL + '/deleteLastWallData').status_code == 200
+    assert client.get(BASE_URL + '/getTotal').get_json()['total'] == 5.0
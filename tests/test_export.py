@@ -0,0 +1,18 @@
+#   /export en CSV: columnas, rango de fechas y nombre del archivo.
+
+from muro_eolico.config import BASE_URL, PROPELLERS
+
+
+def test_export_range_and_filename(client):
+    batch = [
+        {'group': 1, 'date': date, **{propeller: 1.0 for propeller in PROPELLERS}}
+        for date in ('2025-03-03 23:59:59', '2025-03-04 00:00:00', '2025-03-05 23:59:59', '2025-03-06 00:00:00')
+    ]
+    assert client.post(BASE_URL + '/newBatch', json=batch).get_json()['accepted'] == 4
+
+    response = client.get(BASE_URL + '/export?from=2025-03-04&to=2025-03-05&format=csv')
+    assert response.headers['Content-Disposition'] == 'attachment; filename=wall_data_20250304_20250305.csv'
+
+    lines = response.get_data(as_text=True).splitlines()
+    assert lines[0] == 'id,date,group,' + ','.join(PROPELLERS) + ',count,resolution'
+    assert [line.split(',')[1] for line in lines[1:]] == ['2025-03-04 00:00:00', '2025-03-05 23:59:59']
@@ -0,0 +1,18 @@
+#   Importar la app no debe cargar Alembic, APScheduler, numpy, pyarrow ni
+#   cProfile, y tiene que quedar dentro del presupuesto del cold start.
+#   Corre bench/check_import_time.py tal cual, en su propio proceso.
+
+import json
+import os
+import subprocess
+import sys
+
+SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'bench', 'check_import_time.py')
+
+
+def test_import_time_guard():
+    completed = subprocess.run([sys.executable, SCRIPT, '--repeat', '3'], capture_output=True, text=True)
+    assert completed.returncode == 0, completed.stdout + completed.stderr
+
+    results = json.loads(completed.stdout)
+    assert results['forbidden_loaded'] == []
@@ -0,0 +1,71 @@
+#   Los filtros por rango de fechas, readTempLatest y el historial de
+#   estados tienen que usar sus índices. Se revisa el plan con EXPLAIN
+#   QUERY PLAN en SQLite y EXPLAIN en PostgreSQL (con enable_seqscan
+#   apagado, así el plan solo dice si el índice se puede usar).
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from muro_eolico.database import db
+from muro_eolico.models import WallData, TempWallData, SystemStatus
+
+
+def fill(rows):
+    start = datetime(2026, 1, 1)
+    db.session.execute(WallData.__table__.insert(), [
+        {'date': start + timedelta(minutes=i), 'group': i % 3 + 1, 'propeller1': 1.0, 'propeller2': 1.0,
+         'propeller3': 1.0, 'propeller4': 1.0, 'propeller5': 1.0, 'hour_bucket': 0}
+        for i in range(rows)
+    ])
+    # El grupo 2 dejó de mandar lecturas hace mucho: su último id queda lejos
+    # del final y recorrer la llave primaria hacia atrás no sirve
+    db.session.execute(TempWallData.__table__.insert(), [
+        {'date': start + timedelta(minutes=i), 'group': 2 if i < 10 else i % 2 * 2 + 1, 'propeller1': 1.0, 'propeller2': 1.0,
+         'propeller3': 1.0, 'propeller4': 1.0, 'propeller5': 1.0}
+        for i in range(rows)
+    ])
+    db.session.execute(SystemStatus.__table__.insert(), [
+        {'status': i % 2, 'last_update': start + timedelta(minutes=i)} for i in range(rows)
+    ])
+    db.session.commit()
+    db.session.execute(db.text('ANALYZE'))
+    db.session.commit()
+
+
+def explain(query):
+    # Plan de la consulta como texto, una línea por nodo
+    dialect = db.engine.dialect
+    sql = str(query.statement.compile(dialect=dialect, compile_kwargs={'literal_binds': True}))
+    connection = db.session.connection()
+
+    if dialect.name == 'sqlite':
+        return '\n'.join(row[-1] for row in connection.exec_driver_sql('EXPLAIN QUERY PLAN ' + sql))
+
+    connection.exec_driver_sql('SET enable_seqscan = off')
+    return '\n'.join(row[0] for row in connection.exec_driver_sql('EXPLAIN ' + sql))
+
+
+QUERIES = {
+    'date_range': (
+        lambda: WallData.query.filter(WallData.date >= datetime(2026, 1, 2), WallData.date < datetime(2026, 1, 3)),
+        'ix_wall_data_date'
+    ),
+    'read_temp_latest': (
+        lambda: TempWallData.query.filter_by(group=2).order_by(TempWallData.id.desc()).limit(1),
+        'ix_temp_wall_data_group_id'
+    ),
+    'status_history': (
+        lambda: SystemStatus.query.order_by(SystemStatus.last_update.desc()),
+        'ix_system_status_last_update'
+    ),
+}
+
+
+@pytest.mark.parametrize('name', QUERIES)
+def test_query_uses_index(app, name):
+    query, index = QUERIES[name]
+    with app.app_context():
+        fill(3000)
+        plan = explain(query())
+        assert index in plan, plan
@@ -0,0 +1,66 @@
+#   Ingesta asíncrona (INGEST_MODE=async). Cada prueba usa su propia cola:
+#   la del módulo se queda con la app de la primera petición.
+
+import time
+from datetime import datetime
+
+import pytest
+
+from muro_eolico import ingest, routes
+from muro_eolico.aggregates import parse_reading
+from muro_eolico.config import BASE_URL, PROPELLERS
+from muro_eolico.ingest import IngestQueue
+from muro_eolico.models import WallData
+
+
+def reading(group=1, value=1.0):
+    return {'group': group, **{propeller: value for propeller in PROPELLERS}}
+
+
+@pytest.fixture
+def ingest_queue(app, monkeypatch):
+    ingest_queue = IngestQueue(100)
+    ingest_queue.app = app
+    monkeypatch.setattr(routes, 'ingest_queue', ingest_queue)
+    monkeypatch.setattr(routes, 'INGEST_MODE', 'async')
+    monkeypatch.setattr(ingest, 'INGEST_MAX_RETRIES', 2)
+    return ingest_queue
+
+
+def wait_for(ingest_queue, handled, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        stats = ingest_queue.stats()
+        if stats['flushed'] + stats['dropped'] >= handled:
+            return stats
+        time.sleep(0.05)
+    return ingest_queue.stats()
+
+
+def test_invalid_reading_is_rejected_before_queueing(app, client, ingest_queue):
+    statuses = [
+        client.post(BASE_URL + '/new', json=data).status_code
+        for data in (reading(), reading(2), reading(2 ** 70), reading(3))
+    ]
+    assert statuses == [202, 202, 400, 202]
+
+    stats = wait_for(ingest_queue, 3)
+    assert (stats['flushed'], stats['dropped']) == (3, 0)
+    with app.app_context():
+        assert WallData.query.count() == 3
+
+
+def test_failed_flush_only_drops_the_bad_reading(app, ingest_queue, caplog):
+    # La cola guarda lecturas ya validadas; aquí una se salta la validación
+    # para que la base la rechace al guardar el lote
+    now = datetime(2026, 3, 1, 12, 0)
+    batch = [parse_reading(reading(group), now) for group in (1, 2, 3, 1)]
+    batch[2]['group'] = 2 ** 70
+
+    ingest_queue.flush(batch)
+
+    stats = ingest_queue.stats()
+    assert (stats['flushed'], stats['dropped']) == (3, 1)
+    assert 'ingest_reading_dropped' in caplog.text
+    with app.app_context():
+        assert sorted(row.group for row in WallData.query) == [1, 1, 2]
@@ -0,0 +1,62 @@
+#   Endpoints de listas: arreglo completo en streaming, NDJSON y páginas
+#   por id (keyset) con X-Next-After-Id.
+
+import json
+
+from muro_eolico.config import BASE_URL, PROPELLERS
+from muro_eolico.database import db
+
+
+def post_reading(client, group, value=1.0):
+    reading = {'group': group, **{propeller: value for propeller in PROPELLERS}}
+    return client.post(BASE_URL + '/new', json=reading).get_json()['id']
+
+
+def test_streamed_list_returns_connection(app, client):
+    ids = [post_reading(client, group) for group in (1, 2, 3)]
+
+    response = client.get(BASE_URL + '/readAll')
+    assert [row['id'] for row in response.get_json()] == ids
+
+    # Al terminar de enviar el cuerpo la conexión regresa al pool
+    with app.app_context():
+        assert db.engine.pool.checkedout() == 0
+
+
+def test_keyset_pages(client):
+    ids = [post_reading(client, group) for group in (1, 2, 3, 1, 2)]
+
+    seen = []
+    url = BASE_URL + '/readAll?limit=2'
+    while url:
+        response = client.get(url)
+        page = [row['id'] for row in response.get_json()]
+        assert len(page) <= 2
+        seen += page
+        after = response.headers.get('X-Next-After-Id')
+        url = f'{BASE_URL}/readAll?limit=2&after_id={after}' if after else None
+
+    assert seen == ids
+    assert 'X-Next-After-Rollup-Id' not in response.headers
+
+
+def test_descending_pages(client):
+    for status in (1, 0, 1):
+        client.post(BASE_URL + '/update', json={'status': status})
+
+    first = client.get(BASE_URL + '/statusHistory?limit=2')
+    second = client.get(BASE_URL + '/statusHistory?limit=2&after_id=' + first.headers['X-Next-After-Id'])
+    ids = [row['id'] for row in first.get_json() + second.get_json()]
+    assert ids == sorted(ids, reverse=True) and len(ids) == 3
+
+
+def test_ndjson_and_bad_parameters(client):
+    ids = [post_reading(client, group) for group in (1, 2)]
+
+    response = client.get(BASE_URL + '/readAll?format=ndjson')
+    assert response.mimetype == 'application/x-ndjson'
+    assert [json.loads(line)['id'] for line in response.get_data(as_text=True).splitlines()] == ids
+
+    response = client.get(BASE_URL + '/readAll?limit=abc')
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
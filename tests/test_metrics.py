@@ -0,0 +1,51 @@
+#   /metrics en formato de Prometheus. Los contadores son globales del
+#   proceso, las pruebas comparan el antes y el después.
+
+import pytest
+
+from muro_eolico.config import BASE_URL, METRICS_ENABLED, PROPELLERS
+from muro_eolico.metrics import Metrics
+
+pytestmark = pytest.mark.skipif(not METRICS_ENABLED, reason='METRICS_ENABLED is off')
+
+
+def sample(client, line_start):
+    # Valor de la serie que empieza con line_start, 0 si no existe
+    for line in client.get('/metrics').get_data(as_text=True).splitlines():
+        if line.startswith(line_start + ' '):
+            return float(line.rsplit(' ', 1)[1])
+    return 0
+
+
+def test_histogram_render():
+    registry = Metrics()
+    registry.describe('latency_seconds', 'histogram', 'Latency', (0.1, 1))
+    for value in (0.05, 0.5, 2):
+        registry.observe('latency_seconds', (('route', '/x'),), value)
+
+    lines = registry.render().splitlines()
+    assert lines[:2] == ['# HELP latency_seconds Latency', '# TYPE latency_seconds histogram']
+    assert 'latency_seconds_bucket{route="/x",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{route="/x",le="1"} 2' in lines
+    assert 'latency_seconds_bucket{route="/x",le="+Inf"} 3' in lines
+    assert 'latency_seconds_count{route="/x"} 3' in lines
+
+
+def test_request_and_ingest_counters(client):
+    accepted = 'ingest_readings_total{result="accepted"}'
+    invalid = 'ingest_readings_total{result="invalid"}'
+    requests = 'http_request_duration_seconds_count{method="POST",route="/api/v1/new",status="200"}'
+    streamed = 'http_request_duration_seconds_count{method="GET",route="/api/v1/readAll",status="200"}'
+    before = {name: sample(client, name) for name in (accepted, invalid, requests, streamed)}
+
+    reading = {'group': 1, **{propeller: 1.0 for propeller in PROPELLERS}}
+    client.post(BASE_URL + '/new', json=reading)
+    client.post(BASE_URL + '/new', json=reading)
+    client.post(BASE_URL + '/new', json={'group': 1, 'propeller1': 'x'})
+    assert client.get(BASE_URL + '/readAll').get_json() is not None
+
+    assert sample(client, accepted) - before[accepted] == 2
+    assert sample(client, invalid) - before[invalid] == 1
+    assert sample(client, requests) - before[requests] == 2
+    # Una respuesta en streaming cuenta una sola vez, al terminar de enviarse
+    assert sample(client, streamed) - before[streamed] == 1
@@ -0,0 +1,53 @@
+#   Particiones mensuales (WALLDATA_PARTITIONING, solo PostgreSQL). Una
+#   lectura de /newBatch en un mes sin partición cae en la default; crear
+#   después la partición de ese mes tiene que pasarle esas lecturas en vez
+#   de fallar.
+
+import os
+from datetime import date
+
+import pytest
+from flask_migrate import Migrate, upgrade
+
+from muro_eolico.config import BASE_URL, PROPELLERS
+from muro_eolico.database import db
+from muro_eolico.jobs import ensure_partitions, list_partitions
+from muro_eolico.models import WallData
+
+MIGRATIONS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'migrations')
+
+
+@pytest.fixture
+def partitioned(app, monkeypatch):
+    if not app.config['SQLALCHEMY_DATABASE_URI'].startswith('postgresql'):
+        pytest.skip('partitioning is PostgreSQL only')
+
+    monkeypatch.setenv('WALLDATA_PARTITIONING', '1')
+    Migrate(app, db, directory=MIGRATIONS)
+    with app.app_context():
+        db.drop_all()
+        upgrade()
+    yield app
+    with app.app_context():
+        db.session.execute(db.text('DROP TABLE IF EXISTS alembic_version'))
+        db.session.commit()
+
+
+def test_partition_takes_rows_from_default(partitioned):
+    reading = {'group': 1, 'date': '2031-05-20 12:00:00', **{propeller: 1.0 for propeller in PROPELLERS}}
+    response = partitioned.test_client().post(BASE_URL + '/newBatch', json=[reading])
+    assert response.get_json()['accepted'] == 1
+
+    month = date(2031, 5, 1)
+    with partitioned.app_context():
+        default_rows = lambda: db.session.execute(db.text('SELECT count(*) FROM wall_data_default')).scalar()
+        assert default_rows() == 1
+
+        # Dos veces: la segunda no hace nada
+        for _ in range(2):
+            ensure_partitions('wall_data', month, month)
+            db.session.commit()
+
+        assert default_rows() == 0
+        assert ('wall_data_p2031_05', month, date(2031, 6, 1)) in list_partitions('wall_data')
+        assert WallData.query.count() == 1
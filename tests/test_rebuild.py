@@ -0,0 +1,25 @@
+#   /rebuildAggregates recalcula los totales desde WallData, incluido
+#   TotalGroup aunque esté descuadrado.
+
+from muro_eolico.config import BASE_URL, PROPELLERS
+from muro_eolico.database import db
+from muro_eolico.models import TotalGroup
+
+
+def test_rebuild_fixes_group_totals(app, client):
+    batch = [
+        {'group': group, 'date': f'2026-03-0{day} 12:00:00', **{propeller: 1.0 for propeller in PROPELLERS}}
+        for day, group in ((1, 1), (1, 2), (2, 2))
+    ]
+    assert client.post(BASE_URL + '/newBatch', json=batch).get_json()['accepted'] == 3
+
+    with app.app_context():
+        db.session.get(TotalGroup, 1).total = 99.0
+        db.session.add(TotalGroup(7, 3.0))
+        db.session.commit()
+
+    response = client.post(BASE_URL + '/rebuildAggregates?from=2026-03-01&to=2026-03-02')
+    assert response.get_json()['days'] == 2
+
+    assert client.get(BASE_URL + '/get_totals').get_json() == {'group1': 5.0, 'group2': 10.0}
+    assert client.get(BASE_URL + '/getTotal').get_json()['total'] == 15.0
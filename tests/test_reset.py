@@ -0,0 +1,33 @@
+#   resetAll borra todo lo de WallData, también lo que ya se compactó.
+
+from datetime import datetime, timedelta
+
+from muro_eolico import cli, jobs
+from muro_eolico.config import BASE_URL, PROPELLERS
+from muro_eolico.models import WallDataRollup, TotalGroup
+
+
+def test_reset_clears_downsampled_history(app, client, monkeypatch):
+    monkeypatch.setattr(jobs, 'RAW_RETENTION_DAYS', 1)
+    old = datetime.now() - timedelta(days=10)
+    batch = [
+        {'group': group, 'date': (old + timedelta(minutes=group)).strftime('%Y-%m-%d %H:%M:%S'),
+         **{propeller: 1.0 for propeller in PROPELLERS}}
+        for group in (1, 2, 3)
+    ]
+    assert client.post(BASE_URL + '/newBatch', json=batch).get_json()['accepted'] == 3
+
+    with app.app_context():
+        assert jobs.downsample_wall_data() == 3
+        assert WallDataRollup.query.count() > 0
+
+    assert client.delete(BASE_URL + '/resetAll').status_code == 200
+
+    assert client.get(BASE_URL + '/readAll').get_json() == []
+    export = client.get(BASE_URL + '/export?format=csv').get_data(as_text=True)
+    assert export.splitlines()[1:] == []
+
+    result = app.test_cli_runner().invoke(cli.reconcile)
+    assert '0 groups with drift' in result.output
+    with app.app_context():
+        assert TotalGroup.query.count() == 0
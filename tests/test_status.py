@@ -0,0 +1,35 @@
+#   Estado de la Xiao: los heartbeats solo actualizan CurrentStatus y la
+#   historia guarda un intervalo por cada cambio de estado.
+
+from concurrent.futures import ThreadPoolExecutor
+
+from muro_eolico.config import BASE_URL
+from muro_eolico.models import SystemStatus
+
+
+def test_concurrent_first_heartbeats(app):
+    def heartbeat(_):
+        return app.test_client().post(BASE_URL + '/update', json={'status': 1}).status_code
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        assert list(pool.map(heartbeat, range(8))) == [200] * 8
+
+    with app.app_context():
+        assert SystemStatus.query.count() == 1
+
+
+def test_status_history_keeps_one_interval_per_change(client):
+    messages = [
+        client.post(BASE_URL + '/update', json={'status': status}).get_json()['message']
+        for status in (1, 1, 0, 0, 1)
+    ]
+    assert messages == ['New status recorded', 'Heartbeat recorded', 'New status recorded',
+                        'Heartbeat recorded', 'New status recorded']
+
+    history = client.get(BASE_URL + '/statusHistory').get_json()
+    assert [interval['status'] for interval in history] == [1, 0, 1]
+    assert history[0]['end'] is None
+    assert all(interval['end'] is not None for interval in history[1:])
+    assert history[1]['end'] == history[0]['start']
+
+    assert client.get(BASE_URL + '/status').get_json()['status'] == 1